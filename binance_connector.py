@@ -1,12 +1,45 @@
 import asyncio
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import tempfile
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
+from urllib.parse import urlencode
+import aiohttp
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from config import Config
 from utils import logger, timestamp_to_datetime, datetime_to_timestamp, validate_symbol, safe_float_conversion
 
+FUTURES_API_URL = 'https://fapi.binance.com'
+FUTURES_TESTNET_API_URL = 'https://testnet.binancefuture.com'
+
+# 동시에 보낼 수 있는 최대 REST 요청 수 (Config.BINANCE_CONCURRENCY 미설정 시 기본값)
+MAX_CONCURRENT_REQUESTS = 10
+
+# Daily P&L 조회 시 한 페이지(BINANCE_PAGE_LIMIT)에 다 들어오지 않는 날만 24시간을 나눠 동시에 조회할 구간 수
+# (/fapi/v1/income은 요청당 weight 30이므로 대부분의 날은 나누지 않고 한 번에 조회)
+DAILY_PNL_SUB_RANGES = 6
+BINANCE_PAGE_LIMIT = 1000
+
+# 순손익에 포함되는 income 타입
+PNL_INCOME_TYPES = frozenset({'REALIZED_PNL', 'COMMISSION', 'FUNDING_FEE'})
+
+def _trade_key(trade: Dict[str, Any]) -> tuple:
+    """거래 내역 중복 제거 키"""
+    return (trade.get('symbol', ''), trade['id'])
+
+def _income_key(income: Dict[str, Any]) -> tuple:
+    """income 내역 중복 제거 키 (tranId는 타입/심볼별로 겹칠 수 있음)"""
+    return (income.get('tranId'), income.get('tradeId'), income['incomeType'], income.get('symbol', ''))
+
 class BinanceConnector:
     """바이낸스 선물 API 연동 클래스"""
     
@@ -20,12 +53,164 @@ class BinanceConnector:
         )
         
         # 선물 클라이언트 사용
-        self.client.API_URL = 'https://fapi.binance.com'
+        self.client.API_URL = FUTURES_API_URL
         if self.config['testnet']:
-            self.client.API_URL = 'https://testnet.binancefuture.com'
+            self.client.API_URL = FUTURES_TESTNET_API_URL
+        
+        # 동기 클라이언트도 커넥션 풀 재사용 (TLS 핸드셰이크 생략)
+        self.client.session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+        
+        # 서명용 HMAC 키 컨텍스트를 한 번만 만들어 요청마다 copy()로 재사용
+        self._hmac_ctx = hmac.new((self.config['api_secret'] or '').encode(), digestmod=hashlib.sha256)
+        
+        # 비동기 REST 호출용 (이벤트 루프 안에서 지연 생성)
+        self.base_url = self.client.API_URL
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # 동시 요청 수 제한 (바이낸스 weight 한도 초과 방지)
+        # 모든 비동기 조회가 _get을 거치므로 파이프라인 전체가 이 한도를 공유
+        self._req_sem = asyncio.Semaphore(Config.BINANCE_CONCURRENCY or MAX_CONCURRENT_REQUESTS)
+        
+        # 심볼 메타데이터 캐시 (exchange info는 프로세스 동안 거의 바뀌지 않음)
+        self._symbol_info_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        
+        # 과거 구간 K라인/거래 내역 디스크 캐시 (이미 끝난 구간은 바뀌지 않음)
+        self.cache_dir = Config.BINANCE_CACHE_DIR
+        if self.cache_dir and self.config['testnet']:
+            self.cache_dir = os.path.join(self.cache_dir, 'testnet')
+        
+        # 거래 내역은 계정별 데이터이므로 API 키 해시로 캐시 파일을 구분 (키를 바꾸면 다른 계정 캐시를 쓰지 않음)
+        self._account_cache_key = hashlib.sha256((self.config['api_key'] or '').encode()).hexdigest()[:16]
         
         logger.info(f"바이낸스 커넥터 초기화 완료 (테스트넷: {self.config['testnet']})")
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """aiohttp 세션 반환 (없거나 닫혔으면 새로 생성)"""
+        if self._session is None or self._session.closed:
+            # keep-alive 커넥션 풀: 페이지네이션/종목별 호출이 같은 연결을 재사용
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'X-MBX-APIKEY': self.config['api_key'] or ''}
+            )
+        return self._session
+
+    def _sign(self, query: str) -> str:
+        """쿼리 문자열 HMAC-SHA256 서명"""
+        signer = self._hmac_ctx.copy()
+        signer.update(query.encode())
+        return signer.hexdigest()
+
+    async def _get(self, path: str, params: Dict[str, Any] = None, signed: bool = False) -> Any:
+        """선물 REST API GET 요청 (이벤트 루프를 막지 않음)"""
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        if signed:
+            params['timestamp'] = int(time.time() * 1000)
+        
+        query = urlencode(params)
+        if signed:
+            query = f"{query}&signature={self._sign(query)}"
+        
+        url = f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}"
+        session = await self._get_session()
+        
+        async with self._req_sem:
+            async with session.get(url) as response:
+                text = await response.text()
+                if response.status >= 400:
+                    raise BinanceAPIException(response, response.status, text)
+        return json.loads(text)
+
+    async def close(self):
+        """aiohttp 세션 정리"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def _cache_path(self, name: str) -> Optional[str]:
+        """캐시 파일 경로 (캐시 비활성화 시 None)"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, name)
+
+    def _is_cacheable(self, end_timestamp: int) -> bool:
+        """이미 끝난 과거 구간만 캐시 대상"""
+        return bool(self.cache_dir) and end_timestamp < int(time.time() * 1000)
+
+    def _read_cache(self, name: str) -> Any:
+        """디스크 캐시 읽기 (없거나 손상되었으면 None)"""
+        path = self._cache_path(name)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"캐시 읽기 실패 ({name}): {e}")
+            return None
+
+    def _write_cache(self, name: str, data: Any):
+        """디스크 캐시 쓰기 (임시 파일에 쓴 뒤 os.replace로 원자적 교체)"""
+        path = self._cache_path(name)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"캐시 쓰기 실패 ({name}): {e}")
+
+    async def _paginate(self, path: str, params: Dict[str, Any], key_func, label: str, raise_errors: bool = False):
+        """startTime 윈도우 이동 방식 페이지네이션 (새 항목만 배치 단위로 yield)
+
+        마지막 항목의 time으로 startTime을 옮겨가며 조회하고, 같은 밀리초에 걸친
+        항목은 key_func로 중복 제거한다. 응답이 limit보다 적어도 끝이라고 가정하지
+        않고, 새 항목이 더 이상 없을 때 종료한다.
+        """
+        params = dict(params)
+        end_timestamp = params.get('endTime')
+        seen_keys = set()
+        window_time = None
+        
+        while True:
+            try:
+                batch = await self._get(path, params, signed=True)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                logger.warning(f"{label} 페이지네이션 중 오류: {e}")
+                break
+            
+            if not batch:
+                break
+            
+            new_items = [item for item in batch if key_func(item) not in seen_keys]
+            if not new_items:
+                # 한 페이지가 전부 같은 시각의 이미 본 항목이면 다음 밀리초로 넘어감
+                if len(batch) >= params.get('limit', 0) and int(batch[-1]['time']) == window_time:
+                    params['startTime'] = window_time + 1
+                    continue
+                break
+            
+            # 다음 윈도우는 마지막 항목 시각부터 (같은 시각의 항목은 seen_keys로 제외)
+            last_time = int(new_items[-1]['time'])
+            if last_time != window_time:
+                seen_keys = set()
+                window_time = last_time
+            seen_keys.update(key_func(item) for item in new_items if int(item['time']) == last_time)
+            
+            yield new_items
+            
+            if end_timestamp is not None and last_time >= end_timestamp:
+                break
+            params['startTime'] = last_time
+
     async def get_account_trades(self, symbol: str, start_time: datetime = None, end_time: datetime = None, limit: int = 1000) -> List[Dict[str, Any]]:
         """계정의 선물 거래 내역 조회 (페이지네이션)"""
         try:
@@ -44,36 +229,14 @@ class BinanceConnector:
             
             # 페이지네이션으로 모든 거래 내역 수집
             all_trades = []
-            from_id = None
-            
-            while True:
-                try:
-                    params = {
-                        'symbol': symbol,
-                        'startTime': start_timestamp,
-                        'endTime': end_timestamp,
-                        'limit': 1000
-                    }
-                    
-                    if from_id:
-                        params['fromId'] = from_id
-                    
-                    trades_batch = self.client.futures_account_trades(**params)
-                    
-                    if not trades_batch:
-                        break
-                    
-                    all_trades.extend(trades_batch)
-                    
-                    # 다음 페이지가 있으면 마지막 ID + 1 설정
-                    if len(trades_batch) == 1000:
-                        from_id = int(trades_batch[-1]['id']) + 1
-                    else:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"{symbol} 거래 내역 페이지네이션 중 오류: {e}")
-                    break
+            params = {
+                'symbol': symbol,
+                'startTime': start_timestamp,
+                'endTime': end_timestamp,
+                'limit': 1000
+            }
+            async for trades_batch in self._paginate('/fapi/v1/userTrades', params, _trade_key, f"{symbol} 거래 내역"):
+                all_trades.extend(trades_batch)
             
             logger.info(f"{len(all_trades)}개의 거래 내역을 조회했습니다.")
             return all_trades
@@ -91,41 +254,54 @@ class BinanceConnector:
             symbol = validate_symbol(symbol)
             
             # 기본값: 최근 데이터
+            cache_name = None
             if start_time and end_time:
                 start_timestamp = datetime_to_timestamp(start_time)
                 end_timestamp = datetime_to_timestamp(end_time)
                 
-                klines = self.client.futures_klines(
-                    symbol=symbol,
-                    interval=interval,
-                    startTime=start_timestamp,
-                    endTime=end_timestamp,
-                    limit=limit
-                )
+                # 이미 끝난 구간이면 디스크 캐시 사용
+                if self._is_cacheable(end_timestamp):
+                    cache_name = f"klines_{symbol}_{interval}_{start_timestamp}_{end_timestamp}_{limit}.pkl"
+                    cached_df = self._read_cache(cache_name)
+                    if cached_df is not None:
+                        logger.info(f"K라인 데이터 캐시 사용: {symbol} {interval} ({len(cached_df)}개)")
+                        return cached_df
+                
+                klines = await self._get('/fapi/v1/klines', {
+                    'symbol': symbol,
+                    'interval': interval,
+                    'startTime': start_timestamp,
+                    'endTime': end_timestamp,
+                    'limit': limit
+                })
             else:
-                klines = self.client.futures_klines(
-                    symbol=symbol,
-                    interval=interval,
-                    limit=limit
-                )
-            
-            # DataFrame으로 변환
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            # 데이터 타입 변환
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df['open'] = df['open'].astype(float)
-            df['high'] = df['high'].astype(float)
-            df['low'] = df['low'].astype(float)
-            df['close'] = df['close'].astype(float)
-            df['volume'] = df['volume'].astype(float)
-            
-            # 인덱스 설정
-            df.set_index('timestamp', inplace=True)
+                klines = await self._get('/fapi/v1/klines', {
+                    'symbol': symbol,
+                    'interval': interval,
+                    'limit': limit
+                })
+            
+            if not klines:
+                logger.info(f"K라인 데이터 조회 완료: {symbol} {interval} (0개)")
+                return pd.DataFrame()
+            
+            # 한 번에 object 배열로 만든 뒤 컬럼별로 타입을 지정해 DataFrame 생성
+            arr = np.asarray(klines, dtype=object)
+            df = pd.DataFrame({
+                'open': arr[:, 1].astype(np.float64),
+                'high': arr[:, 2].astype(np.float64),
+                'low': arr[:, 3].astype(np.float64),
+                'close': arr[:, 4].astype(np.float64),
+                'volume': arr[:, 5].astype(np.float64),
+                'close_time': arr[:, 6].astype(np.int64),
+                'quote_asset_volume': arr[:, 7].astype(np.float64),
+                'number_of_trades': arr[:, 8].astype(np.int64),
+                'taker_buy_base_asset_volume': arr[:, 9].astype(np.float64),
+                'taker_buy_quote_asset_volume': arr[:, 10].astype(np.float64),
+            }, index=pd.DatetimeIndex(pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'), name='timestamp'))
+            
+            if cache_name:
+                self._write_cache(cache_name, df)
             
             logger.info(f"K라인 데이터 조회 완료: {symbol} {interval} ({len(df)}개)")
             return df
@@ -138,29 +314,37 @@ class BinanceConnector:
             return pd.DataFrame()
 
     async def get_multiple_timeframe_data(self, symbol: str, timeframes: List[str], start_time: datetime = None, end_time: datetime = None) -> Dict[str, pd.DataFrame]:
-        """여러 시간 프레임의 데이터를 동시에 조회"""
-        tasks = []
+        """여러 시간 프레임의 데이터를 동시에 조회 (도착하는 순서대로 처리)"""
+        async def fetch(timeframe: str):
+            return timeframe, await self.get_kline_data(symbol, timeframe, start_time, end_time)
         
-        for timeframe in timeframes:
-            task = self.get_kline_data(symbol, timeframe, start_time, end_time)
-            tasks.append(task)
+        results = {}
+        for next_result in asyncio.as_completed([fetch(timeframe) for timeframe in timeframes]):
+            timeframe, df = await next_result
+            results[timeframe] = df
         
-        results = await asyncio.gather(*tasks)
-        
-        return {
-            timeframes[i]: results[i] 
-            for i in range(len(timeframes))
-        }
+        # 요청한 순서대로 반환
+        return {timeframe: results[timeframe] for timeframe in timeframes}
+
+    def _fetch_exchange_info(self) -> Dict[str, Dict[str, Any]]:
+        """exchange info를 한 번만 받아 심볼별 dict로 캐싱"""
+        if self._symbol_info_cache is None:
+            exchange_info = self.client.futures_exchange_info()
+            self._symbol_info_cache = {info['symbol']: info for info in exchange_info['symbols']}
+        return self._symbol_info_cache
+
+    def refresh_exchange_info(self):
+        """심볼 메타데이터 캐시 무효화 (다음 조회 시 다시 받아옴)"""
+        self._symbol_info_cache = None
 
     def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
         """심볼 정보 조회"""
         try:
             symbol = validate_symbol(symbol)
-            exchange_info = self.client.futures_exchange_info()
+            symbol_info = self._fetch_exchange_info().get(symbol)
             
-            for symbol_info in exchange_info['symbols']:
-                if symbol_info['symbol'] == symbol:
-                    return symbol_info
+            if symbol_info:
+                return symbol_info
             
             logger.warning(f"심볼 정보를 찾을 수 없습니다: {symbol}")
             return {}
@@ -191,10 +375,9 @@ class BinanceConnector:
         df['datetime'] = pd.to_datetime(df['time'], unit='ms')
         
         # 숫자 타입 변환
-        numeric_columns = ['price', 'qty', 'quoteQty', 'commission']
-        for col in numeric_columns:
-            if col in df.columns:
-                df[col] = df[col].astype(float)
+        numeric_columns = [col for col in ('price', 'qty', 'quoteQty', 'commission') if col in df.columns]
+        if numeric_columns:
+            df[numeric_columns] = df[numeric_columns].astype(float)
         
         # 정렬
         df = df.sort_values('time')
@@ -205,10 +388,22 @@ class BinanceConnector:
         logger.info(f"거래 데이터 포맷팅 완료: {len(df)}개 거래")
         return df
 
+    def format_trades_for_analysis_light(self, trades: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """거래 데이터를 컬럼별 NumPy 배열로 변환 (합계/평균만 필요한 경우 pandas 생략)"""
+        count = len(trades)
+        to_float = safe_float_conversion
+        return {
+            'time': np.fromiter((int(trade['time']) for trade in trades), dtype=np.int64, count=count),
+            'price': np.fromiter((to_float(trade['price']) for trade in trades), dtype=np.float64, count=count),
+            'qty': np.fromiter((to_float(trade['qty']) for trade in trades), dtype=np.float64, count=count),
+            'quoteQty': np.fromiter((to_float(trade['quoteQty']) for trade in trades), dtype=np.float64, count=count),
+            'commission': np.fromiter((to_float(trade.get('commission', 0)) for trade in trades), dtype=np.float64, count=count),
+        }
+
     async def get_position_info(self, symbol: str = None) -> List[Dict[str, Any]]:
         """현재 포지션 정보 조회"""
         try:
-            positions = self.client.futures_position_information(symbol=symbol)
+            positions = await self._get('/fapi/v2/positionRisk', {'symbol': symbol}, signed=True)
             
             # 열린 포지션만 필터링
             open_positions = [
@@ -239,39 +434,15 @@ class BinanceConnector:
             
             # 페이지네이션으로 REALIZED_PNL 수익 히스토리 수집
             all_income = []
-            from_id = None
-            
-            while True:
-                try:
-                    params = {
-                        'incomeType': 'REALIZED_PNL',
-                        'startTime': start_timestamp,
-                        'endTime': end_timestamp,
-                        'limit': 1000
-                    }
-                    
-                    if symbol:
-                        params['symbol'] = symbol
-                    
-                    if from_id:
-                        params['incomeId'] = from_id
-                    
-                    income_batch = self.client.futures_income_history(**params)
-                    
-                    if not income_batch:
-                        break
-                    
-                    all_income.extend(income_batch)
-                    
-                    # 다음 페이지가 있으면 마지막 ID - 1 설정
-                    if len(income_batch) == 1000:
-                        from_id = int(income_batch[-1]['incomeId']) - 1
-                    else:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"포지션 히스토리 페이지네이션 중 오류: {e}")
-                    break
+            params = {
+                'incomeType': 'REALIZED_PNL',
+                'symbol': symbol,
+                'startTime': start_timestamp,
+                'endTime': end_timestamp,
+                'limit': 1000
+            }
+            async for income_batch in self._paginate('/fapi/v1/income', params, _income_key, "포지션 히스토리"):
+                all_income.extend(income_batch)
             
             logger.info(f"{len(all_income)}개의 포지션 히스토리를 조회했습니다.")
             return all_income
@@ -295,35 +466,62 @@ class BinanceConnector:
             
             logger.info(f"Daily P&L 조회: {target_date.strftime('%Y-%m-%d')}")
             
-            # 페이지네이션으로 모든 income 데이터 수집
-            all_income = await self._get_all_income_history(start_timestamp, end_timestamp)
+            # income/거래 내역을 동시에 조회 (한 페이지를 넘는 경우에만 구간을 나눠 조회)
+            income_results, trade_results = await asyncio.gather(
+                self._get_day_window('/fapi/v1/income', self._get_all_income_history, start_timestamp, end_timestamp),
+                self._get_day_window('/fapi/v1/userTrades', self._get_all_trades, start_timestamp, end_timestamp,
+                                     cache_name=self._trades_cache_name(start_timestamp, end_timestamp))
+            )
             
-            # REALIZED_PNL만 필터링 (realized_positions 개수용)
-            realized_pnl_items = [item for item in all_income if item['incomeType'] == 'REALIZED_PNL']
+            # 구간 경계 중복은 ID로 제거하면서 한 번만 순회하며 집계
+            # (행 수만큼 반복되는 루프라 전역/속성 조회를 지역 변수로 바인딩)
+            to_float = safe_float_conversion
+            pnl_income_types = PNL_INCOME_TYPES
+            income_key = _income_key
+            trade_key_of = _trade_key
             
-            # 순손익 계산 (실현손익 + 수수료 + 펀딩피)
             daily_pnl = 0.0
-            for income in all_income:
-                income_type = income['incomeType']
-                asset = income.get('asset', '')
-                amount = safe_float_conversion(income['income'])
-                
-                # USDT 기준 income만 계산
-                if asset == 'USDT' and income_type in ['REALIZED_PNL', 'COMMISSION', 'FUNDING_FEE']:
-                    daily_pnl += amount
-            
-            # 페이지네이션으로 모든 거래 데이터 수집
-            all_trades = await self._get_all_trades(start_timestamp, end_timestamp)
-            
-            daily_volume = sum(safe_float_conversion(trade['quoteQty']) for trade in all_trades)
-            trade_count = len(all_trades)
+            realized_count = 0
+            seen_income_ids = set()
+            mark_income_seen = seen_income_ids.add
+            for income_list in income_results:
+                for income in income_list:
+                    income_type = income['incomeType']
+                    key = income_key(income)
+                    if key in seen_income_ids:
+                        continue
+                    mark_income_seen(key)
+                    
+                    # REALIZED_PNL 개수 (realized_positions용)
+                    if income_type == 'REALIZED_PNL':
+                        realized_count += 1
+                    
+                    # 순손익 계산 (USDT 기준 실현손익 + 수수료 + 펀딩피)
+                    if income_type in pnl_income_types and income.get('asset', '') == 'USDT':
+                        daily_pnl += to_float(income['income'])
+            
+            unique_trades = []
+            seen_trade_ids = set()
+            mark_trade_seen = seen_trade_ids.add
+            for trade_list in trade_results:
+                for trade in trade_list:
+                    trade_key = trade_key_of(trade)
+                    if trade_key in seen_trade_ids:
+                        continue
+                    mark_trade_seen(trade_key)
+                    unique_trades.append(trade)
+            
+            # 거래량은 합계만 필요하므로 DataFrame 없이 NumPy 배열로 계산
+            trade_arrays = self.format_trades_for_analysis_light(unique_trades)
+            daily_volume = float(trade_arrays['quoteQty'].sum())
+            trade_count = len(unique_trades)
             
             daily_summary = {
                 'date': target_date.strftime('%Y-%m-%d'),
                 'daily_pnl_usd': daily_pnl,
                 'trading_volume': daily_volume,
                 'trade_count': trade_count,
-                'realized_positions': len(realized_pnl_items)
+                'realized_positions': realized_count
             }
             
             logger.info(f"Daily P&L 조회 완료: {daily_pnl:.2f} USD (거래 {trade_count}건, 거래량 {daily_volume:.2f} USDT)")
@@ -333,74 +531,104 @@ class BinanceConnector:
             logger.error(f"Daily P&L 조회 중 오류: {e}")
             return {}
 
+    async def _get_day_window(self, path: str, fetch_all, start_timestamp: int, end_timestamp: int,
+                              cache_name: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """하루 구간 조회 결과를 구간별 목록으로 반환
+        
+        첫 페이지를 전체 구간으로 한 번 조회해 한 페이지에 다 들어오면 그대로 사용하고 (요청 1회),
+        가득 찬 경우에만 DAILY_PNL_SUB_RANGES개 구간으로 나눠 fetch_all로 동시에 페이지네이션
+        """
+        if cache_name:
+            cached = self._read_cache(cache_name)
+            if cached is not None:
+                logger.info(f"거래 내역 캐시 사용: {len(cached)}개")
+                return [cached]
+        
+        try:
+            first_page = await self._get(path, {
+                'startTime': start_timestamp,
+                'endTime': end_timestamp,
+                'limit': BINANCE_PAGE_LIMIT
+            }, signed=True)
+            if len(first_page) < BINANCE_PAGE_LIMIT:
+                if cache_name:
+                    self._write_cache(cache_name, first_page)
+                return [first_page]
+        except Exception as e:
+            logger.warning(f"{path} 조회 중 오류, 구간별 조회로 대체: {e}")
+        
+        sub_ranges = self._split_time_range(start_timestamp, end_timestamp, DAILY_PNL_SUB_RANGES)
+        return list(await asyncio.gather(*(fetch_all(s, e) for s, e in sub_ranges)))
+
+    @staticmethod
+    def _split_time_range(start_timestamp: int, end_timestamp: int, parts: int) -> List[tuple]:
+        """[start, end] 구간을 겹치지 않는 parts개의 하위 구간으로 분할 (endTime은 포함 구간)"""
+        step = max(1, (end_timestamp - start_timestamp) // parts)
+        ranges = []
+        sub_start = start_timestamp
+        while sub_start <= end_timestamp:
+            sub_end = min(sub_start + step - 1, end_timestamp)
+            if len(ranges) == parts - 1:
+                sub_end = end_timestamp
+            ranges.append((sub_start, sub_end))
+            sub_start = sub_end + 1
+        return ranges
+
+    async def _iter_income_history(self, start_timestamp: int, end_timestamp: int):
+        """페이지네이션으로 income 히스토리를 페이지(배치) 단위로 yield"""
+        params = {
+            'startTime': start_timestamp,
+            'endTime': end_timestamp,
+            'limit': 1000
+        }
+        async for income_batch in self._paginate('/fapi/v1/income', params, _income_key, "Income 히스토리"):
+            yield income_batch
+
     async def _get_all_income_history(self, start_timestamp: int, end_timestamp: int) -> List[Dict[str, Any]]:
         """페이지네이션으로 모든 income 히스토리 수집"""
         all_income = []
-        from_id = None
-        
-        while True:
-            try:
-                params = {
-                    'startTime': start_timestamp,
-                    'endTime': end_timestamp,
-                    'limit': 1000
-                }
-                
-                if from_id:
-                    params['incomeId'] = from_id
-                
-                income_batch = self.client.futures_income_history(**params)
-                
-                if not income_batch:
-                    break
-                
-                all_income.extend(income_batch)
-                
-                # 다음 페이지가 있으면 마지막 ID 설정
-                if len(income_batch) == 1000:
-                    from_id = int(income_batch[-1]['incomeId']) - 1
-                else:
-                    break
-                    
-            except Exception as e:
-                logger.warning(f"Income 히스토리 페이지네이션 중 오류: {e}")
-                break
+        async for income_batch in self._iter_income_history(start_timestamp, end_timestamp):
+            all_income.extend(income_batch)
         
         logger.info(f"총 {len(all_income)}개의 income 항목 수집")
         return all_income
 
+    async def _iter_trades(self, start_timestamp: int, end_timestamp: int, raise_errors: bool = False):
+        """페이지네이션으로 거래 내역을 페이지(배치) 단위로 yield"""
+        params = {
+            'startTime': start_timestamp,
+            'endTime': end_timestamp,
+            'limit': 1000
+        }
+        async for trades_batch in self._paginate('/fapi/v1/userTrades', params, _trade_key, "거래 내역", raise_errors):
+            yield trades_batch
+
+    def _trades_cache_name(self, start_timestamp: int, end_timestamp: int) -> Optional[str]:
+        """거래 내역 캐시 파일 이름 (계정별로 구분, 캐시 대상이 아니면 None)"""
+        if not self._is_cacheable(end_timestamp):
+            return None
+        return f"trades_{self._account_cache_key}_{start_timestamp}_{end_timestamp}.pkl"
+
     async def _get_all_trades(self, start_timestamp: int, end_timestamp: int) -> List[Dict[str, Any]]:
-        """페이지네이션으로 모든 거래 내역 수집"""
-        all_trades = []
-        from_id = None
+        """페이지네이션으로 모든 거래 내역 수집 (과거 구간은 디스크 캐시)"""
+        cache_name = self._trades_cache_name(start_timestamp, end_timestamp)
+        if cache_name:
+            cached_trades = self._read_cache(cache_name)
+            if cached_trades is not None:
+                logger.info(f"거래 내역 캐시 사용: {len(cached_trades)}개")
+                return cached_trades
         
-        while True:
-            try:
-                params = {
-                    'startTime': start_timestamp,
-                    'endTime': end_timestamp,
-                    'limit': 1000
-                }
-                
-                if from_id:
-                    params['fromId'] = from_id
-                
-                trades_batch = self.client.futures_account_trades(**params)
-                
-                if not trades_batch:
-                    break
-                
+        all_trades = []
+        try:
+            async for trades_batch in self._iter_trades(start_timestamp, end_timestamp, raise_errors=True):
                 all_trades.extend(trades_batch)
-                
-                # 다음 페이지가 있으면 마지막 ID + 1 설정
-                if len(trades_batch) == 1000:
-                    from_id = int(trades_batch[-1]['id']) + 1
-                else:
-                    break
-                    
-            except Exception as e:
-                logger.warning(f"거래 내역 페이지네이션 중 오류: {e}")
-                break
+        except Exception as e:
+            # 중간에 실패한 불완전한 결과는 캐시하지 않음
+            logger.warning(f"거래 내역 페이지네이션 중 오류: {e}")
+            cache_name = None
+        
+        if cache_name:
+            self._write_cache(cache_name, all_trades)
         
         logger.info(f"총 {len(all_trades)}개의 거래 내역 수집")
         return all_trades
@@ -408,7 +636,7 @@ class BinanceConnector:
     async def get_account_balance(self) -> Dict[str, Any]:
         """계정 잔고 정보 조회"""
         try:
-            account_info = self.client.futures_account()
+            account_info = await self._get('/fapi/v2/account', signed=True)
             
             balance_info = {
                 'total_wallet_balance': safe_float_conversion(account_info.get('totalWalletBalance', 0)),
@@ -441,18 +669,12 @@ class BinanceConnector:
             start_timestamp = int(start_time.timestamp() * 1000)
             end_timestamp = int(end_time.timestamp() * 1000)
             
-            # 바이낸스 선물 거래 내역 조회 (전체)
-            trades = self.client.futures_account_trades(
-                startTime=start_timestamp,
-                endTime=end_timestamp,
-                limit=1000  # 최대 1000개
-            )
-            
-            # 거래한 고유 심볼들 추출
+            # 바이낸스 선물 거래 내역 조회 (전체, 1000개 초과분도 페이지네이션)
+            # 조회 실패 시 빈 목록 대신 아래 기본 종목으로 대체되도록 오류를 그대로 전달
             traded_symbols = set()
-            for trade in trades:
-                symbol = trade['symbol']
-                traded_symbols.add(symbol)
+            async for trades_batch in self._iter_trades(start_timestamp, end_timestamp, raise_errors=True):
+                # 거래한 고유 심볼들 추출
+                traded_symbols.update(trade['symbol'] for trade in trades_batch)
             
             traded_symbols_list = list(traded_symbols)
             logger.info(f"자동 탐지된 거래 종목: {len(traded_symbols_list)}개 - {', '.join(traded_symbols_list)}")
@@ -464,10 +686,10 @@ class BinanceConnector:
             # 실패시 기본 주요 종목들 반환
             return ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'XRPUSDT']
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """API 연결 테스트"""
         try:
-            self.client.futures_ping()
+            await self._get('/fapi/v1/ping')
             logger.info("바이낸스 API 연결 테스트 성공")
             return True
         except Exception as e:
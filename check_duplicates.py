@@ -4,6 +4,7 @@ Supabase 테이블 중복 데이터 확인 스크립트
 """
 
 import asyncio
+from collections import Counter
 from supabase_manager import SupabaseManager
 from utils import logger
 
@@ -15,13 +16,30 @@ async def check_duplicates():
         # Supabase 연결
         supabase = SupabaseManager()
         
+        # 전체 테이블 데이터는 필요할 때만 한 번 조회 (RPC 미설치 시 폴백 등)
+        trades = None
+        position_groups = None
+        
+        async def load_trades():
+            nonlocal trades
+            if trades is None:
+                trades = await supabase.get_all_trades()
+            return trades
+        
+        def load_position_groups():
+            nonlocal position_groups
+            if position_groups is None:
+                position_groups = supabase.supabase.table('position_groups').select('*').execute().data
+            return position_groups
+        
         # 1. trades 테이블 중복 확인
         logger.info("📊 trades 테이블 중복 확인...")
-        trades = await supabase.get_all_trades()
         
-        # trade_id 기준 중복 확인
-        trade_ids = [trade['trade_id'] for trade in trades]
-        duplicate_trade_ids = [tid for tid in set(trade_ids) if trade_ids.count(tid) > 1]
+        # trade_id 기준 중복 확인 (DB에서 GROUP BY, RPC가 없으면 메모리에서 집계)
+        duplicate_trade_ids = await supabase.get_duplicate_trade_ids()
+        if duplicate_trade_ids is None:
+            trade_id_counts = Counter(trade['trade_id'] for trade in await load_trades())
+            duplicate_trade_ids = [tid for tid, count in trade_id_counts.items() if count > 1]
         
         if duplicate_trade_ids:
             logger.warning(f"⚠️ trades 테이블에 중복된 trade_id 발견: {len(duplicate_trade_ids)}개")
@@ -32,17 +50,13 @@ async def check_duplicates():
         # 2. position_groups 테이블 중복 확인
         logger.info("📊 position_groups 테이블 중복 확인...")
         
-        # 모든 포지션 그룹 조회
-        result = supabase.supabase.table('position_groups').select('*').execute()
-        position_groups = result.data
-        
-        # 중복 확인을 위한 키 생성 (symbol + start_time + side)
-        position_keys = []
-        for pos in position_groups:
-            key = f"{pos['symbol']}_{pos['start_time']}_{pos['side']}"
-            position_keys.append(key)
-        
-        duplicate_position_keys = [key for key in set(position_keys) if position_keys.count(key) > 1]
+        # 중복 확인 키 (symbol + start_time + side)
+        duplicate_position_keys = await supabase.get_duplicate_position_keys()
+        if duplicate_position_keys is None:
+            position_key_counts = Counter(
+                (pos['symbol'], pos['start_time'], pos['side']) for pos in load_position_groups()
+            )
+            duplicate_position_keys = [key for key, count in position_key_counts.items() if count > 1]
         
         if duplicate_position_keys:
             logger.warning(f"⚠️ position_groups 테이블에 중복된 포지션 발견: {len(duplicate_position_keys)}개")
@@ -50,19 +64,24 @@ async def check_duplicates():
         else:
             logger.info("✅ position_groups 테이블에 중복 데이터 없음")
         
-        # 3. 통계 정보
+        # 3. 통계 정보 (행 수는 DB에서 count만 받아옴)
+        trades_count = supabase.supabase.table('trades').select('id', count='exact').limit(1).execute().count
+        positions_count = supabase.supabase.table('position_groups').select('id', count='exact').limit(1).execute().count
         logger.info("📈 테이블 통계:")
-        logger.info(f"   - trades 테이블: {len(trades)}개 레코드")
-        logger.info(f"   - position_groups 테이블: {len(position_groups)}개 레코드")
+        logger.info(f"   - trades 테이블: {trades_count}개 레코드")
+        logger.info(f"   - position_groups 테이블: {positions_count}개 레코드")
         
         # 4. 최근 데이터 확인
         logger.info("📅 최근 데이터 확인:")
-        if trades:
-            latest_trade = max(trades, key=lambda x: x['time'])
+        # 최신 행만 DB 정렬(인덱스)로 한 건 조회
+        latest_trades = supabase.supabase.table('trades').select('*').order('time', desc=True).limit(1).execute().data
+        if latest_trades:
+            latest_trade = latest_trades[0]
             logger.info(f"   - 최근 거래: {latest_trade['symbol']} ({latest_trade['trade_date']})")
         
-        if position_groups:
-            latest_position = max(position_groups, key=lambda x: x['start_time'])
+        latest_positions = supabase.supabase.table('position_groups').select('*').order('start_time', desc=True).limit(1).execute().data
+        if latest_positions:
+            latest_position = latest_positions[0]
             logger.info(f"   - 최근 포지션: {latest_position['symbol']} ({latest_position['start_time'][:10]})")
         
         logger.info("✅ 중복 데이터 확인 완료!")
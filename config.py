@@ -13,12 +13,25 @@ class Config:
     BINANCE_SECRET_KEY = os.getenv('BINANCE_SECRET_KEY')
     BINANCE_TESTNET = os.getenv('BINANCE_TESTNET', 'False').lower() == 'true'
     
+    # 과거 K라인/거래 내역 디스크 캐시 경로 (빈 값이면 캐시 비활성화)
+    BINANCE_CACHE_DIR = os.getenv('BINANCE_CACHE_DIR', '.cache/binance')
+    
+    # 바이낸스 REST 동시 요청 수 (모든 병렬 조회가 공유하는 한도)
+    BINANCE_CONCURRENCY = int(os.getenv('BINANCE_CONCURRENCY', '10'))
+    
     # OpenAI API 설정
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     
     # Notion API 설정
     NOTION_TOKEN = os.getenv('NOTION_TOKEN')
     NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
+    # 페이지 내용 지문을 저장할 텍스트 속성 이름 (빈 값이면 비활성화, 같은 내용이면 블록 재작성 생략)
+    NOTION_FINGERPRINT_PROPERTY = os.getenv('NOTION_FINGERPRINT_PROPERTY', '')
+    # 기존 페이지 내용 교체 방식
+    # batch_delete: 기존 블록을 동시에 삭제한 뒤 새 블록 추가 (기본값)
+    # archive_recreate: 블록이 NOTION_ARCHIVE_MIN_BLOCKS개보다 많으면 페이지를 보관하고 새로 생성 (페이지 ID가 바뀜)
+    NOTION_UPDATE_STRATEGY = os.getenv('NOTION_UPDATE_STRATEGY', 'batch_delete')
+    NOTION_ARCHIVE_MIN_BLOCKS = int(os.getenv('NOTION_ARCHIVE_MIN_BLOCKS', '10'))
     
     # Supabase 설정 (선택사항)
     SUPABASE_URL = os.getenv('SUPABASE_URL')
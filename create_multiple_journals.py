@@ -2,11 +2,11 @@
 """
 📅 다중 날짜 매매일지 생성 스크립트
 
-8/1~4일까지의 매매일지를 순차적으로 생성하여 Notion에 업로드합니다.
+8/1~4일까지의 매매일지를 동시에(최대 3일씩) 생성하여 Notion에 업로드합니다.
 """
 
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 import os
 
@@ -15,8 +15,12 @@ from config import Config
 from utils import logger, setup_logging
 from main import EmotionalTradingJournal
 
+# 동시에 생성할 최대 날짜 수 (바이낸스/Notion API 호출 제한 고려)
+MAX_CONCURRENT_DAYS = 3
+
 async def create_journals_for_date_range(start_date: str, end_date: str):
     """지정된 날짜 범위의 매매일지 생성"""
+    journal_system = None
     try:
         # 날짜 파싱
         start_dt = datetime.strptime(start_date, '%Y-%m-%d')
@@ -26,43 +30,15 @@ async def create_journals_for_date_range(start_date: str, end_date: str):
         journal_system = EmotionalTradingJournal()
         
         # 날짜 범위 생성
-        current_date = start_dt
         total_days = (end_dt - start_dt).days + 1
         
         logger.info(f"📅 {start_date} ~ {end_date} 매매일지 생성 시작 ({total_days}일)")
         print(f"📅 {start_date} ~ {end_date} 매매일지 생성 시작 ({total_days}일)")
         
-        success_count = 0
-        failed_dates = []
-        
-        # 각 날짜별로 매매일지 생성
-        for i in range(total_days):
-            current_date = start_dt + timedelta(days=i)
-            date_str = current_date.strftime('%Y-%m-%d')
-            
-            logger.info(f"📝 [{i+1}/{total_days}] {date_str} 매매일지 생성 중...")
-            print(f"📝 [{i+1}/{total_days}] {date_str} 매매일지 생성 중...")
-            
-            try:
-                # 매매일지 생성
-                success = await journal_system.run_full_pipeline(current_date)
-                
-                if success:
-                    logger.info(f"✅ {date_str} 매매일지 생성 완료!")
-                    print(f"✅ {date_str} 매매일지 생성 완료!")
-                    success_count += 1
-                else:
-                    logger.error(f"❌ {date_str} 매매일지 생성 실패")
-                    print(f"❌ {date_str} 매매일지 생성 실패")
-                    failed_dates.append(date_str)
-                
-                # API 호출 제한을 위한 대기 (1초)
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"❌ {date_str} 매매일지 생성 중 오류: {e}")
-                print(f"❌ {date_str} 매매일지 생성 중 오류: {e}")
-                failed_dates.append(date_str)
+        # 거래 동기화는 범위 전체에 대해 한 번만 하고, 날짜별 매매일지는 동시에 생성 (API 호출 제한을 위해 최대 3일씩)
+        failed = await journal_system.run_pipeline_for_range(start_dt, end_dt, MAX_CONCURRENT_DAYS)
+        failed_dates = [failed_date.strftime('%Y-%m-%d') for failed_date in failed]
+        success_count = total_days - len(failed_dates)
         
         # 결과 요약
         logger.info(f"🎉 매매일지 생성 완료! 성공: {success_count}/{total_days}")
@@ -81,6 +57,9 @@ async def create_journals_for_date_range(start_date: str, end_date: str):
         logger.error(f"❌ 다중 매매일지 생성 중 오류: {e}")
         print(f"❌ 오류: {e}")
         return False
+    finally:
+        if journal_system:
+            await journal_system.close()
 
 async def main():
     """메인 실행 함수"""
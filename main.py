@@ -12,21 +12,54 @@
 
 import asyncio
 import argparse
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from operator import itemgetter
+from typing import Dict, List, Any, Tuple
 import sys
 import os
+import numpy as np
+import pandas as pd
 
 # 프로젝트 모듈 import
 from config import Config
-from utils import logger, ensure_directory_exists, timestamp_to_datetime
+from utils import logger, ensure_directory_exists, timestamp_to_datetime, format_time_of_day_array, gather_or_cancel
 from binance_connector import BinanceConnector
-from profit_calculator import ProfitCalculator
-# from gpt_feedback import GPTFeedbackGenerator
+from profit_calculator import ProfitCalculator, MARKET_REFERENCE_SYMBOLS
+# from gpt_feedback import feedback_generator
 from sentiment_generator import SentimentGenerator
 from notion_uploader import NotionUploader
 from supabase_manager import SupabaseManager
 
+# 날짜 범위 실행 시 동시에 처리할 최대 날짜 수 (바이낸스/Notion 요청 한도는 각 클라이언트가 별도로 제한)
+MAX_CONCURRENT_DAYS = 4
+
+
+def _net_position_groups(signed_qtys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int, float]:
+    """
+    누적 Net Position이 0에 도달하는 지점 기준으로 거래 구간 분할
+    
+    Returns:
+        (완료 그룹 시작 인덱스, 끝 인덱스, 직전 net position, 미완료 구간 시작 인덱스, 최종 net position)
+    """
+    net_positions = np.cumsum(signed_qtys)
+    candidates = np.flatnonzero(np.abs(net_positions) < 0.1)
+    
+    # 그룹은 2건 이상 거래여야 하므로 연속된 후보 구간에서는 하나씩 건너뛰며 종료
+    # (구간이 0번 거래에서 시작하면 홀수 번째, 아니면 짝수 번째 후보가 종료 지점)
+    run_heads = np.ones(len(candidates), dtype=bool)
+    run_heads[1:] = np.diff(candidates) != 1
+    run_first = candidates[run_heads][np.cumsum(run_heads) - 1]
+    closes = (candidates - run_first) % 2 == (run_first == 0)
+    
+    group_ends = candidates[closes]
+    group_starts = np.concatenate(([0], group_ends[:-1] + 1)).astype(np.int64)[:len(group_ends)]
+    prev_net_positions = net_positions[group_ends - 1]
+    open_start = int(group_ends[-1]) + 1 if len(group_ends) else 0
+    current_net_position = float(net_positions[-1]) if len(net_positions) else 0.0
+    return group_starts, group_ends, prev_net_positions, open_start, current_net_position
+
 class EmotionalTradingJournal:
     """감성적인 매매일지 생성 시스템"""
     
@@ -37,7 +70,7 @@ class EmotionalTradingJournal:
         # 핵심 컴포넌트 초기화
         self.binance = BinanceConnector()
         self.profit_calc = ProfitCalculator()
-        # self.gpt_feedback = GPTFeedbackGenerator()  # OpenAI 기능 비활성화
+        # self.gpt_feedback = feedback_generator  # OpenAI 기능 비활성화
         self.sentiment = SentimentGenerator()
         self.notion_uploader = NotionUploader()
         
@@ -51,14 +84,19 @@ class EmotionalTradingJournal:
         
         logger.info("✅ 모든 컴포넌트 초기화 완료!")
 
-    async def run_full_pipeline(self, target_date: datetime) -> bool:
-        """전체 파이프라인 실행"""
+    async def close(self):
+        """외부 API 세션 정리"""
+        await self.binance.close()
+        await self.notion_uploader.close()
+
+    async def run_full_pipeline(self, target_date: datetime, sync_trades: bool = True) -> bool:
+        """전체 파이프라인 실행 (sync_trades=False면 거래 동기화가 이미 끝났다고 보고 생략)"""
         try:
             logger.info(f"📅 {target_date.strftime('%Y-%m-%d')} 매매일지 생성 시작...")
             
             # Supabase 사용 가능하면 새로운 방식, 아니면 기존 방식
             if self.supabase:
-                return await self._run_supabase_pipeline(target_date)
+                return await self._run_supabase_pipeline(target_date, sync_trades)
             else:
                 return await self._run_legacy_pipeline(target_date)
                 
@@ -66,7 +104,43 @@ class EmotionalTradingJournal:
             logger.error(f"❌ 파이프라인 실행 중 오류 발생: {e}")
             return False
 
-    async def _run_supabase_pipeline(self, target_date: datetime) -> bool:
+    async def run_pipeline_for_range(self, start_date: datetime, end_date: datetime,
+                                     max_concurrent_days: int = MAX_CONCURRENT_DAYS) -> List[datetime]:
+        """날짜 범위의 파이프라인을 한 프로세스에서 동시에 실행 (최대 max_concurrent_days일씩), 실패한 날짜 반환
+        
+        거래 동기화는 범위 전체에 대해 한 번만 실행하고, 날짜별로는 포지션 그룹/일별 P&L/Notion 업로드만 동시에 실행
+        (날짜마다 겹치는 7일 구간을 다시 동기화하면 같은 거래를 여러 번 조회/저장하게 됨)
+        """
+        dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        
+        if self.supabase:
+            try:
+                # 각 날짜의 단일 실행과 같은 구간 (마지막 날짜부터 시작 날짜 6일 전까지)
+                await self._sync_trades_to_supabase(
+                    [end_date - timedelta(days=i) for i in range(len(dates) + 6)]
+                )
+            except Exception as e:
+                logger.error(f"❌ 범위 거래 동기화 실패: {e}")
+                return dates
+        
+        semaphore = asyncio.Semaphore(max_concurrent_days)
+        
+        async def run_one(target_date: datetime) -> bool:
+            async with semaphore:
+                return await self.run_full_pipeline(target_date, sync_trades=False)
+        
+        results = await asyncio.gather(*(run_one(target_date) for target_date in dates), return_exceptions=True)
+        
+        failed_dates = []
+        for target_date, result in zip(dates, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ {target_date.strftime('%Y-%m-%d')} 파이프라인 실행 중 오류: {result}")
+                failed_dates.append(target_date)
+            elif not result:
+                failed_dates.append(target_date)
+        return failed_dates
+
+    async def _run_supabase_pipeline(self, target_date: datetime, sync_trades: bool = True) -> bool:
         """Supabase 기반 새로운 파이프라인"""
         try:
             logger.info("🚀 매매일지 생성 파이프라인 시작...")
@@ -74,18 +148,20 @@ class EmotionalTradingJournal:
             
             # 1. Binance → Supabase 데이터 동기화
             logger.info("📊 STEP 1: Binance에서 최신 데이터 수집 및 Supabase 업데이트")
-            await self._sync_all_data_to_supabase(target_date)
+            if sync_trades:
+                await self._sync_all_data_to_supabase(target_date)
+            else:
+                await self._update_daily_data_in_supabase(target_date)
             logger.info("=" * 60)
             
-            # 2. 해당 날짜에 완료된 포지션만 조회
+            # 2~3. 완료된 포지션과 일별 P&L 데이터를 동시에 조회 (하나라도 실패하면 함께 취소)
             logger.info("📊 STEP 2: 완료된 포지션 데이터 조회")
-            closed_positions = await self.supabase.get_closed_positions_for_date(target_date)
-            logger.info(f"✅ {len(closed_positions)}개 완료 포지션 발견")
-            logger.info("=" * 60)
-            
-            # 3. 일별 P&L 데이터 조회
             logger.info("📊 STEP 3: 일별 P&L 데이터 조회")
-            daily_pnl_data = await self.binance.get_daily_pnl(target_date)
+            closed_positions, daily_pnl_data = await gather_or_cancel(
+                self.supabase.get_closed_positions_for_date(target_date),
+                self.binance.get_daily_pnl(target_date)
+            )
+            logger.info(f"✅ {len(closed_positions)}개 완료 포지션 발견")
             logger.info(f"✅ 일별 P&L: ${daily_pnl_data['daily_pnl_usd']:.2f}")
             logger.info("=" * 60)
             
@@ -133,28 +209,38 @@ class EmotionalTradingJournal:
             logger.info(f"자동 탐지된 거래 종목: {len(traded_symbols)}개 - {', '.join(traded_symbols)}")
             logger.info(f"🎯 분석할 종목들: {', '.join(traded_symbols)}")
             
-            # 모든 거래 데이터 수집
-            all_trades = []
-            all_position_history = []
+            # 종목별로 거래 내역/포지션 히스토리를 동시에 조회하고 바로 포지션 그룹핑
+            # (원본 거래 데이터는 종목 처리 후 버리고 그룹 결과만 유지)
+            # 동시 요청 수는 BinanceConnector의 세마포어가 제한
+            async def process_symbol(symbol: str):
+                fetches = [
+                    self.binance.get_account_trades(symbol, start_time, end_time),
+                    self.binance.get_position_history(symbol, start_time, end_time)
+                ]
+                # K라인은 시장 유형 판단에 쓰이는 기준 종목만 조회
+                if symbol in MARKET_REFERENCE_SYMBOLS:
+                    fetches.append(self.binance.get_kline_data(symbol, '5m', start_time, end_time))
+                trades, positions, *klines = await gather_or_cancel(*fetches)
+                symbol_groups = self._create_position_history_from_api(positions, trades)
+                return len(trades), len(positions), symbol_groups, (klines[0] if klines else None)
+            
+            symbol_results = await gather_or_cancel(*(process_symbol(symbol) for symbol in traded_symbols))
+            
+            total_trades = 0
+            total_position_history = 0
+            positions = []
             all_kline_data = {}
+            for symbol, (trade_count, position_count, symbol_groups, klines) in zip(traded_symbols, symbol_results):
+                total_trades += trade_count
+                total_position_history += position_count
+                positions.extend(symbol_groups)
+                if klines is not None:
+                    all_kline_data[symbol] = klines
             
-            for symbol in traded_symbols:
-                # 거래 내역
-                trades = await self.binance.get_account_trades(symbol, start_time, end_time)
-                all_trades.extend(trades)
-                
-                # 포지션 히스토리
-                positions = await self.binance.get_position_history(symbol, start_time, end_time)
-                all_position_history.extend(positions)
-                
-                # K라인 데이터
-                klines = await self.binance.get_kline_data(symbol, '5m', start_time, end_time)
-                all_kline_data[symbol] = klines
-            
-            logger.info(f"💹 총 {len(all_trades)}개의 거래 발견")
-            logger.info(f"📊 총 {len(all_position_history)}개의 포지션 수익 발견")
+            logger.info(f"💹 총 {total_trades}개의 거래 발견")
+            logger.info(f"📊 총 {total_position_history}개의 포지션 수익 발견")
             
-            if not all_trades:
+            if not total_trades:
                 logger.warning("❌ 거래 데이터가 없습니다!")
                 return await self._create_empty_journal(target_date)
             
@@ -172,14 +258,12 @@ class EmotionalTradingJournal:
             else:
                 daily_pnl_data['daily_pnl_percentage'] = 0.0
             
-            # 포지션 히스토리 생성 (Net Position 기반)
-            logger.info("📊 포지션 히스토리 생성 중...")
-            positions = self._create_position_history_from_api(all_position_history, all_trades)
+            # 포지션 히스토리 (Net Position 기반, 종목별 그룹 결과를 PnL 기준 내림차순 정렬)
+            positions.sort(key=lambda x: x['pnl_amount'], reverse=True)
             logger.info(f"Net Position 기준 포지션 그룹핑 완료: {len(positions)}개 포지션 그룹")
             
             # 시장 분석
-            market_type = self.profit_calc.get_market_type(positions, all_kline_data)
-            difficulty_level = self.profit_calc.get_difficulty_level(positions, 0.5)  # 기본 승률
+            market_type, difficulty_level = self.profit_calc.analyze_market(positions, all_kline_data, win_rate=0.5)  # 기본 승률
             market_analysis = {
                 'market_type': market_type,
                 'difficulty_level': difficulty_level
@@ -215,13 +299,22 @@ class EmotionalTradingJournal:
             
             logger.info("✅ 매매일지 데이터 생성 완료!")
             
-            # daily_pnl 테이블에 매매 요약 저장 (Supabase 사용 가능한 경우만)
+            # Notion 업로드와 daily_pnl 저장은 서로 독립적이므로 동시에 실행
+            # (daily_pnl 테이블에 매매 요약 저장은 Supabase 사용 가능한 경우만)
+            logger.info("📝 Notion 업로드 시작...")
+            uploads = [self.notion_uploader.create_emotional_journal_page(journal_data)]
             if self.supabase:
-                await self._save_daily_pnl_to_supabase(target_date, journal_data)
+                uploads.append(self._save_daily_pnl_to_supabase(target_date, journal_data))
+            results = await asyncio.gather(*uploads, return_exceptions=True)
             
-            # Notion 업로드
-            logger.info("📝 Notion 업로드 시작...")
-            success = await self.notion_uploader.create_emotional_journal_page(journal_data)
+            for result in results[1:]:
+                if isinstance(result, Exception):
+                    logger.error(f"❌ daily_pnl 저장 실패: {result}")
+            
+            success = results[0]
+            if isinstance(success, Exception):
+                logger.error(f"❌ Notion 업로드 중 오류: {success}")
+                return False
             
             if success:
                 logger.info("✅ Notion 업로드 완료!")
@@ -239,59 +332,113 @@ class EmotionalTradingJournal:
         try:
             logger.info(f"🔄 Binance → Supabase 데이터 동기화 시작...")
             
-            # 1. 최근 7일간의 거래 종목 수집 (API 제한 우회)
+            # 1~2. 최근 7일간의 거래 데이터 동기화
+            total_trades_saved = await self._sync_trades_to_supabase(
+                [target_date - timedelta(days=i) for i in range(7)]
+            )
+            
+            # 3~4. 대상 날짜의 포지션 그룹과 일별 P&L 업데이트
+            position_groups = await self._update_daily_data_in_supabase(target_date)
+            
+            logger.info("✅ Binance → Supabase 데이터 동기화 완료!")
+            logger.info(f"   - 거래 데이터: {total_trades_saved}개")
+            logger.info(f"   - 포지션 그룹: {len(position_groups) if position_groups else 0}개")
+            logger.info(f"   - 일별 P&L: {target_date.date()}")
+            
+        except Exception as e:
+            logger.error(f"❌ Supabase 데이터 동기화 실패: {e}")
+            raise
+
+    async def _sync_trades_to_supabase(self, sync_dates: List[datetime]) -> int:
+        """지정한 날짜들(최신 날짜부터)의 Binance 거래를 Supabase trades 테이블에 동기화, 저장한 거래 수 반환"""
+        try:
+            # 1. 동기화 기간의 거래 종목 수집 (API 제한 우회, 날짜별로 동시에 조회)
+            day_windows = []
+            for sync_date in sync_dates:
+                start_time = sync_date.replace(hour=9, minute=0, second=0, microsecond=0)
+                day_windows.append((sync_date, start_time, start_time + timedelta(days=1)))
+            
+            symbols_per_day = await gather_or_cancel(*(
+                self.binance.get_all_traded_symbols_for_date(start_time, end_time)
+                for _, start_time, end_time in day_windows
+            ))
             all_symbols = set()
-            for i in range(7):  # 7일간
-                check_date = target_date - timedelta(days=i)
-                start_time = check_date.replace(hour=9, minute=0, second=0, microsecond=0)
-                end_time = start_time + timedelta(days=1)
-                
-                symbols = await self.binance.get_all_traded_symbols_for_date(start_time, end_time)
+            for symbols in symbols_per_day:
                 all_symbols.update(symbols)
+            all_symbols = sorted(all_symbols)
             
             logger.info(f"📊 발견된 거래 종목: {len(all_symbols)}개")
             
             # 2. 각 종목별로 거래 데이터 수집 및 저장 (최적화)
-            total_trades_saved = 0
+            # 종목별 최신 거래 시간 확인 (한 번의 쿼리)
+            latest_times = await self.supabase.get_latest_trade_times(all_symbols)
+            
+            # 오래된 날짜순 윈도우와 각 윈도우의 종료 시각 (정수 ms, trades.time과 같은 단위)
+            windows_oldest_first = day_windows[::-1]
+            window_ends_ms = [int(end_time.timestamp() * 1000) for _, _, end_time in windows_oldest_first]
+            
+            # 이미 저장된 최신 거래 이후의 (종목, 날짜) 조합만 수집 대상
+            sync_targets = []
             for symbol in all_symbols:
-                # 해당 종목의 최신 거래 데이터 확인
-                latest_trade = await self._get_latest_trade_for_symbol(symbol)
-                
-                if latest_trade:
-                    # 이미 저장된 최신 거래 이후부터만 수집
-                    latest_time = latest_trade['time']
-                    logger.info(f"📊 {symbol}: 최신 거래 시간 {latest_time} 이후부터 수집")
+                latest_time = latest_times.get(symbol)
+                if latest_time and latest_time < 10 ** 12:
+                    # Binance 거래 시간은 ms 단위 (초 단위 값이면 윈도우 비교가 모두 어긋나므로 전체 기간 재수집)
+                    first_window = 0
+                    logger.warning(f"⚠️ {symbol}: 최신 거래 시간 단위 오류 (ms 아님: {latest_time}), 최근 7일간 다시 수집")
+                elif latest_time:
+                    # 최신 거래가 포함된 9시 기준 윈도우부터만 수집 (이전 날짜는 순회하지 않음)
+                    # 해당 윈도우의 나머지 거래를 놓치지 않도록 이 윈도우는 매 실행마다 다시 수집
+                    first_window = bisect_right(window_ends_ms, latest_time)
+                    logger.info(f"📊 {symbol}: 최신 거래 시간 {latest_time}이 포함된 날짜부터 다시 수집")
                 else:
                     # 처음 수집하는 종목이면 최근 7일간 수집
-                    latest_time = None
+                    first_window = 0
                     logger.info(f"📊 {symbol}: 처음 수집, 최근 7일간 데이터 수집")
                 
-                # 최신 거래 이후의 데이터만 수집
-                for i in range(7):  # 7일간 일별로
-                    sync_date = target_date - timedelta(days=i)
-                    start_time = sync_date.replace(hour=9, minute=0, second=0, microsecond=0)
-                    end_time = start_time + timedelta(days=1)
-                    
-                    # 이미 저장된 데이터는 건너뛰기
-                    if latest_time and start_time.timestamp() * 1000 <= latest_time:
-                        continue
-                    
-                    # 거래 데이터 수집 및 저장
-                    trades = await self.binance.get_account_trades(symbol, start_time, end_time)
-                    if trades:
-                        await self.supabase.save_trades(trades, sync_date)
-                        total_trades_saved += len(trades)
-                        logger.info(f"✅ {symbol} ({sync_date.date()}): {len(trades)}개 거래 저장")
+                for sync_date, start_time, end_time in windows_oldest_first[first_window:]:
+                    sync_targets.append((symbol, sync_date, start_time, end_time))
+            
+            # 동시 Binance 요청 수는 BinanceConnector의 세마포어가 제한
+            fetched = await gather_or_cancel(*(
+                self.binance.get_account_trades(symbol, start_time, end_time)
+                for symbol, _, start_time, end_time in sync_targets
+            ))
+            
+            # 날짜별로 모아서 한 번에 저장 (종목 × 날짜마다 요청하지 않음)
+            trades_by_date = {}
+            for (symbol, sync_date, _, _), trades in zip(sync_targets, fetched):
+                if not trades:
+                    continue
+                logger.info(f"📊 {symbol} ({sync_date.date()}): {len(trades)}개 거래 수집")
+                trades_by_date.setdefault(sync_date, []).extend(trades)
+            
+            await gather_or_cancel(*(
+                self.supabase.save_trades(trades, sync_date)
+                for sync_date, trades in trades_by_date.items()
+            ))
+            # upsert된 행 수 (같은 배치 안의 중복 trade_id는 save_trades에서 한 번만 저장)
+            total_trades_saved = sum(
+                len({trade['id'] for trade in trades}) for trades in trades_by_date.values()
+            )
             
             logger.info(f"📊 총 {total_trades_saved}개 거래 데이터 저장 완료")
+            return total_trades_saved
             
-            # 3. 포지션 그룹핑 업데이트 (해당 날짜 9시 기준으로 포지션 그룹 재생성)
+        except Exception as e:
+            logger.error(f"❌ 거래 데이터 동기화 실패: {e}")
+            raise
+
+    async def _update_daily_data_in_supabase(self, target_date: datetime) -> List[Dict[str, Any]]:
+        """저장된 거래로 대상 날짜의 position_groups, daily_pnl 테이블 업데이트, 생성한 포지션 그룹 반환"""
+        try:
+            # 3~4. 포지션 그룹 재생성(해당 날짜 9시 기준)과 일별 P&L 수집을 동시에 실행
+            # 일별 P&L은 포지션 그룹을 방금 재생성한 대상 날짜만 저장 (이전 날짜의 포지션 수를 덮어쓰지 않음)
             logger.info("🔄 포지션 그룹핑 업데이트 중...")
-            position_groups = await self.supabase.update_position_groups(target_date)
-            
-            # 4. 일별 P&L 데이터 수집 및 저장
             logger.info("📊 일별 P&L 데이터 수집 중...")
-            daily_pnl_data = await self.binance.get_daily_pnl(target_date)
+            position_groups, daily_pnl_data = await gather_or_cancel(
+                self.supabase.update_position_groups(target_date),
+                self.binance.get_daily_pnl(target_date)
+            )
             
             # daily_pnl 테이블에 저장할 데이터 구성
             daily_pnl_record = {
@@ -302,31 +449,12 @@ class EmotionalTradingJournal:
             }
             
             await self.supabase.save_daily_pnl(daily_pnl_record, target_date)
-            
-            logger.info("✅ Binance → Supabase 데이터 동기화 완료!")
-            logger.info(f"   - 거래 데이터: {total_trades_saved}개")
-            logger.info(f"   - 포지션 그룹: {len(position_groups) if position_groups else 0}개")
-            logger.info(f"   - 일별 P&L: {target_date.date()}")
+            return position_groups
             
         except Exception as e:
-            logger.error(f"❌ Supabase 데이터 동기화 실패: {e}")
+            logger.error(f"❌ {target_date.date()} 포지션 그룹/일별 P&L 업데이트 실패: {e}")
             raise
 
-    async def _get_latest_trade_for_symbol(self, symbol: str) -> Optional[Dict]:
-        """특정 종목의 최신 거래 데이터 조회"""
-        try:
-            result = self.supabase.supabase.table('trades').select('*').eq(
-                'symbol', symbol
-            ).order('time', desc=True).limit(1).execute()
-            
-            if result.data:
-                return result.data[0]
-            return None
-            
-        except Exception as e:
-            logger.error(f"❌ {symbol} 최신 거래 조회 실패: {e}")
-            return None
-
     async def _create_journal_data_from_supabase(self, target_date: datetime, closed_positions: List[Dict], daily_pnl_data: Dict) -> Dict:
         """Supabase 데이터로부터 매매일지 데이터 생성"""
         try:
@@ -335,33 +463,39 @@ class EmotionalTradingJournal:
             end_time = start_time + timedelta(days=1)
             daily_trades = await self.supabase.get_all_trades(start_time, end_time)
             
-            # 포지션별 거래 데이터 매핑
-            position_trades = {}
+            # 종목별 거래 인덱스 (시간순 정렬 후 포지션 기간을 이진 탐색)
+            position_trades = defaultdict(list)
             for trade in daily_trades:
-                symbol = trade['symbol']
-                if symbol not in position_trades:
-                    position_trades[symbol] = []
-                position_trades[symbol].append(trade)
+                position_trades[trade['symbol']].append(trade)
+            
+            trade_index = {}
+            for symbol, symbol_trades in position_trades.items():
+                symbol_trades.sort(key=itemgetter('time'))
+                trade_index[symbol] = (
+                    [int(t['time']) for t in symbol_trades],
+                    np.fromiter((float(t['commission']) for t in symbol_trades), dtype=np.float64, count=len(symbol_trades))
+                )
             
             # 포지션 데이터 변환 (수수료 정보 추가)
             positions = []
+            symbols_seen = set()
             for pos in closed_positions:
                 symbol = pos['symbol']
-                symbol_trades = position_trades.get(symbol, [])
+                symbols_seen.add(symbol)
                 
                 # 해당 포지션 기간의 거래들 필터링 (시간 범위로 추정)
                 position_start = datetime.fromisoformat(pos['start_time'])
                 position_end = datetime.fromisoformat(pos['end_time']) if pos['end_time'] else position_start
+                start_ms = position_start.timestamp() * 1000
+                end_ms = position_end.timestamp() * 1000
                 
-                # 포지션 기간과 겹치는 거래들 찾기
-                position_related_trades = []
-                for trade in symbol_trades:
-                    trade_time = datetime.fromtimestamp(trade['time'] / 1000)
-                    if position_start <= trade_time <= position_end:
-                        position_related_trades.append(trade)
-                
-                # 수수료 계산
-                total_commission = sum(float(trade['commission']) for trade in position_related_trades)
+                # 포지션 기간과 겹치는 거래들의 수수료 계산
+                total_commission = 0.0
+                if symbol in trade_index:
+                    trade_times, commissions = trade_index[symbol]
+                    lo = bisect_left(trade_times, start_ms)
+                    hi = bisect_right(trade_times, end_ms)
+                    total_commission = float(commissions[lo:hi].sum())
                 
                 # 시간 정보를 Supabase 데이터 그대로 사용
                 # 진입 시간 (HH:MM:SS 형식)
@@ -409,14 +543,11 @@ class EmotionalTradingJournal:
                 'position_count': len(positions)
             }
             
-            # 승률 계산
-            win_positions = [pos for pos in positions if float(pos.get('pnl_amount', 0)) > 0]
-            win_rate = (len(win_positions) / len(positions) * 100) if positions else 0
-            
-            # 시장 분석 (Supabase에서는 간소화)
+            # 시장 분석 (Supabase에서는 간소화, price_data 없이 횡보장 / 승률은 포지션 손익으로 계산)
+            market_type, difficulty_level = self.profit_calc.analyze_market(positions)
             market_analysis = {
-                'market_type': '횡보장',  # 간소화 (price_data 없이 판단하기 어려움)
-                'difficulty_level': self.profit_calc.get_difficulty_level(positions, win_rate)
+                'market_type': market_type,
+                'difficulty_level': difficulty_level
             }
             
             # 감정적 요소 생성
@@ -431,7 +562,7 @@ class EmotionalTradingJournal:
                 'difficulty_level': market_analysis['difficulty_level'],
                 'daily_summary': daily_summary,
                 'positions': positions,
-                'trading_symbols': list(set(pos['symbol'] for pos in positions))
+                'trading_symbols': list(symbols_seen)
             }
             
         except Exception as e:
@@ -441,29 +572,41 @@ class EmotionalTradingJournal:
     def _create_position_history_from_api(self, all_position_history: List[Dict], all_trades: List[Dict]) -> List[Dict]:
         """API 데이터로부터 포지션 히스토리 생성 (Net Position 그룹핑)"""
         try:
-            # 심볼별로 그룹핑
-            symbol_groups = {}
-            for pos in all_position_history:
-                symbol = pos['symbol']
-                if symbol not in symbol_groups:
-                    symbol_groups[symbol] = []
-                symbol_groups[symbol].append(pos)
-            
-            # 거래 데이터도 심볼별로 그룹핑
-            trades_by_symbol = {}
-            for trade in all_trades:
-                symbol = trade['symbol']
-                if symbol not in trades_by_symbol:
-                    trades_by_symbol[symbol] = []
-                trades_by_symbol[symbol].append(trade)
-            
-            # 각 심볼별로 Net Position 그룹핑
+            if not all_position_history or not all_trades:
+                return []
+            
+            # 거래 데이터를 한 번에 DataFrame으로 변환
+            trades_df = pd.DataFrame(all_trades, columns=['symbol', 'id', 'side', 'price', 'qty', 'time'])
+            trades_df = trades_df.astype({'price': 'float64', 'qty': 'float64', 'time': 'int64'})
+            trades_df['trade_id'] = trades_df['id'].astype(str)
+            # 정수 시간 배열을 안정 정렬한 순서로 모든 컬럼을 한 번에 재배열
+            time_order = np.argsort(trades_df['time'].to_numpy(), kind='stable')
+            trades_df = trades_df.take(time_order)
+            
+            # 심볼 + Trade ID별 PnL 매핑 (같은 거래는 마지막 income 사용)
+            income_df = pd.DataFrame(all_position_history, columns=['symbol', 'tradeId', 'income'])
+            income_df['trade_id'] = income_df['tradeId'].fillna('').astype(str)
+            income_df['pnl'] = income_df['income'].fillna(0).astype('float64')
+            income_df = income_df[income_df['trade_id'] != ''].drop_duplicates(['symbol', 'trade_id'], keep='last')
+            trades_df = trades_df.merge(income_df[['symbol', 'trade_id', 'pnl']], on=['symbol', 'trade_id'], how='left', sort=False)
+            trades_df['pnl'] = trades_df['pnl'].fillna(0.0)
+            
+            # 각 심볼별로 Net Position 그룹핑 (포지션 히스토리에 나온 심볼 순서)
+            trades_by_symbol = dict(tuple(trades_df.groupby('symbol', sort=False)))
             all_position_groups = []
-            for symbol in symbol_groups:
-                symbol_positions = symbol_groups[symbol]
-                symbol_trades = trades_by_symbol.get(symbol, [])
+            for symbol in dict.fromkeys(pos['symbol'] for pos in all_position_history):
+                symbol_trades = trades_by_symbol.get(symbol)
+                if symbol_trades is None:
+                    continue
                 
-                position_groups = self._group_positions_by_net_position(symbol, symbol_positions, symbol_trades)
+                position_groups = self._group_positions_by_net_position(
+                    symbol,
+                    prices=symbol_trades['price'].to_numpy(),
+                    qtys=symbol_trades['qty'].to_numpy(),
+                    is_buy=(symbol_trades['side'] == 'BUY').to_numpy(),
+                    times=symbol_trades['time'].to_numpy(),
+                    pnls=symbol_trades['pnl'].to_numpy()
+                )
                 all_position_groups.extend(position_groups)
             
             # PnL 기준으로 내림차순 정렬
@@ -475,161 +618,58 @@ class EmotionalTradingJournal:
             logger.error(f"❌ 포지션 히스토리 생성 실패: {e}")
             return []
 
-    def _group_positions_by_net_position(self, symbol: str, positions: List[Dict], trades: List[Dict]) -> List[Dict]:
-        """Net Position 기준으로 포지션 그룹핑"""
+    def _group_positions_by_net_position(self, symbol: str, prices: np.ndarray, qtys: np.ndarray, is_buy: np.ndarray,
+                                         times: np.ndarray, pnls: np.ndarray) -> List[Dict]:
+        """Net Position 기준으로 포지션 그룹핑 (시간순 정렬된 거래 배열 입력)"""
         try:
-            # 거래를 시간순으로 정렬
-            trades.sort(key=lambda x: int(x['time']))
-            
-            # Trade ID별 PnL 매핑
-            pnl_map = {}
-            for pos in positions:
-                trade_id = str(pos.get('tradeId', ''))
-                if trade_id:
-                    pnl_map[trade_id] = float(pos.get('income', 0))
+            n = len(prices)
+            if not n:
+                return []
+            
+            # 거래량 방향 설정 (BUY는 +, SELL은 -)
+            signed_qtys = np.where(is_buy, qtys, -qtys)
+            group_starts, group_ends, prev_net_positions, open_start, current_net_position = _net_position_groups(signed_qtys)
+            
+            # 그룹별 합계를 한 번에 계산 (완료 그룹 + 마지막 미완료 구간)
+            bounds = group_starts if open_start >= n else np.append(group_starts, open_start)
+            notionals = prices * qtys
+            group_pnls = np.add.reduceat(pnls, bounds)
+            buy_costs = np.add.reduceat(np.where(is_buy, notionals, 0.0), bounds)
+            buy_qtys = np.add.reduceat(np.where(is_buy, qtys, 0.0), bounds)
+            sell_costs = np.add.reduceat(np.where(is_buy, 0.0, notionals), bounds)
+            sell_qtys = np.add.reduceat(np.where(is_buy, 0.0, qtys), bounds)
+            buy_counts = np.add.reduceat(is_buy.astype(np.int64), bounds)
+            group_qtys = np.add.reduceat(qtys, bounds)
+            ends = np.append(group_ends, n - 1)
+            
+            # 그룹 시작/종료 시각 문자열을 한 번에 포맷팅
+            start_time_strs = format_time_of_day_array(times[bounds])
+            end_time_strs = format_time_of_day_array(times[ends])
             
             position_groups = []
-            current_group_trades = []
-            current_net_position = 0.0
-            
-            for trade in trades:
-                price = float(trade['price'])
-                qty = float(trade['qty'])
-                side = trade['side']
-                
-                # 거래량 방향 설정 (BUY는 +, SELL은 -)
-                trade_qty = qty if side == 'BUY' else -qty
-                prev_net_position = current_net_position
-                current_net_position += trade_qty
+            for k in range(len(bounds)):
+                # 완료 그룹은 Net position이 0에 도달한 구간, 마지막 구간은 미완료 포지션
+                is_open = k == len(group_ends)
+                if is_open and abs(current_net_position) <= 0.1:
+                    continue
                 
-                current_group_trades.append(trade)
+                group_pnl = float(group_pnls[k])
+                if abs(group_pnl) <= 0.001:  # 유의미한 손익만
+                    continue
                 
-                # Net position이 0에 도달하면 포지션 그룹 완료
-                if abs(current_net_position) < 0.1 and len(current_group_trades) > 1:
-                    group_pnl = sum(pnl_map.get(str(t.get('id', '')), 0) for t in current_group_trades)
-                    
-                    if abs(group_pnl) > 0.001:  # 유의미한 손익만
-                        # 그룹의 첫 거래와 마지막 거래
-                        first_trade = current_group_trades[0]
-                        last_trade = current_group_trades[-1]
-                        
-                        # 포지션 방향 결정
-                        if prev_net_position > 0:
-                            position_side = 'Long'
-                            # 진입 거래들 (BUY)
-                            entry_trades = [t for t in current_group_trades if t['side'] == 'BUY']
-                        else:
-                            position_side = 'Short'
-                            # 진입 거래들 (SELL)
-                            entry_trades = [t for t in current_group_trades if t['side'] == 'SELL']
-                        
-                        # 평균 진입가 계산
-                        if entry_trades:
-                            total_cost = sum(float(t['price']) * float(t['qty']) for t in entry_trades)
-                            total_qty = sum(float(t['qty']) for t in entry_trades)
-                            avg_entry_price = total_cost / total_qty if total_qty > 0 else float(first_trade['price'])
-                        else:
-                            avg_entry_price = float(first_trade['price'])
-                            total_qty = sum(float(t['qty']) for t in current_group_trades)
-                        
-                        # 청산가 (마지막 거래 가격)
-                        exit_price = float(last_trade['price'])
-                        
-                        # 수익률 계산
-                        if position_side == 'Long':
-                            pnl_percentage = ((exit_price - avg_entry_price) / avg_entry_price) * 100
-                        else:
-                            pnl_percentage = ((avg_entry_price - exit_price) / avg_entry_price) * 100
-                        
-                        # 시간 정보
-                        start_time = datetime.fromtimestamp(int(first_trade['time']) / 1000)
-                        end_time = datetime.fromtimestamp(int(last_trade['time']) / 1000)
-                        duration_minutes = (int(last_trade['time']) - int(first_trade['time'])) / 60000
-                        
-                        position_group = {
-                            'symbol': symbol,
-                            'side': position_side,
-                            'entry_price': avg_entry_price,
-                            'exit_price': exit_price,
-                            'quantity': total_qty,
-                            'pnl_amount': group_pnl,
-                            'pnl_percentage': pnl_percentage,
-                            'start_time': start_time.strftime('%H:%M:%S'),
-                            'end_time': end_time.strftime('%H:%M:%S'),
-                            'duration_minutes': duration_minutes,
-                            'trade_count': len(current_group_trades),
-                            'position_type': 'Closed'
-                        }
-                        
-                        position_groups.append(position_group)
-                    
-                    # 그룹 초기화
-                    current_group_trades = []
-                
-                # 포지션 방향이 바뀌는 경우 (오버 트레이딩)
-                elif (prev_net_position > 0 and current_net_position < 0) or (prev_net_position < 0 and current_net_position > 0):
-                    # 이전 포지션 종료 및 새 포지션 시작 처리
-                    # 복잡한 케이스이므로 현재는 단순하게 처리
-                    pass
-            
-            # 마지막에 미완료 포지션이 있는 경우 처리
-            if current_group_trades and abs(current_net_position) > 0.1:
-                group_pnl = sum(pnl_map.get(str(t.get('id', '')), 0) for t in current_group_trades)
-                
-                if abs(group_pnl) > 0.001:  # 유의미한 손익만
-                    # 그룹의 첫 거래와 마지막 거래
-                    first_trade = current_group_trades[0]
-                    last_trade = current_group_trades[-1]
-                    
-                    # 포지션 방향 결정 (net position 기준)
-                    if current_net_position > 0:
-                        position_side = 'Long'
-                        # 진입 거래들 (BUY)
-                        entry_trades = [t for t in current_group_trades if t['side'] == 'BUY']
-                    else:
-                        position_side = 'Short'
-                        # 진입 거래들 (SELL)
-                        entry_trades = [t for t in current_group_trades if t['side'] == 'SELL']
-                    
-                    # 평균 진입가 계산
-                    if entry_trades:
-                        total_cost = sum(float(t['price']) * float(t['qty']) for t in entry_trades)
-                        total_qty = sum(float(t['qty']) for t in entry_trades)
-                        avg_entry_price = total_cost / total_qty if total_qty > 0 else float(first_trade['price'])
-                    else:
-                        avg_entry_price = float(first_trade['price'])
-                        total_qty = abs(current_net_position)
-                    
-                    # 미완료 포지션이므로 마지막 거래 가격을 현재가로 사용
-                    current_price = float(last_trade['price'])
-                    
-                    # 수익률 계산 (미실현 손익 기반)
-                    if position_side == 'Long':
-                        pnl_percentage = ((current_price - avg_entry_price) / avg_entry_price) * 100
-                    else:
-                        pnl_percentage = ((avg_entry_price - current_price) / avg_entry_price) * 100
-                    
-                    # 시간 정보
-                    start_time = datetime.fromtimestamp(int(first_trade['time']) / 1000)
-                    end_time = datetime.fromtimestamp(int(last_trade['time']) / 1000)
-                    duration_minutes = (int(last_trade['time']) - int(first_trade['time'])) / 60000
-                    
-                    position_group = {
-                        'symbol': symbol,
-                        'side': position_side,
-                        'entry_price': avg_entry_price,
-                        'exit_price': current_price,
-                        'quantity': abs(current_net_position),
-                        'pnl_amount': group_pnl,
-                        'pnl_percentage': pnl_percentage,
-                        'start_time': start_time.strftime('%H:%M:%S'),
-                        'end_time': end_time.strftime('%H:%M:%S'),
-                        'duration_minutes': duration_minutes,
-                        'trade_count': len(current_group_trades),
-                        'position_type': 'Open'  # 미완료 포지션 표시
-                    }
-                    
-                    position_groups.append(position_group)
+                start = int(bounds[k])
+                end = int(ends[k])
+                buy_count = int(buy_counts[k])
+                position_groups.append(self._build_position_group(
+                    symbol, prices, times, start, end,
+                    time_strs=(start_time_strs[k], end_time_strs[k]),
+                    net_position=current_net_position if is_open else float(prev_net_positions[k]),
+                    group_pnl=group_pnl,
+                    buy_stats=(buy_count, float(buy_costs[k]), float(buy_qtys[k])),
+                    sell_stats=(end - start + 1 - buy_count, float(sell_costs[k]), float(sell_qtys[k])),
+                    group_qty=float(group_qtys[k]),
+                    is_open=is_open
+                ))
             
             return position_groups
             
@@ -637,6 +677,60 @@ class EmotionalTradingJournal:
             logger.error(f"❌ {symbol} 포지션 그룹핑 실패: {e}")
             return []
 
+    def _build_position_group(self, symbol: str, prices: np.ndarray, times: np.ndarray, start: int, end: int,
+                              time_strs: Tuple[str, str], net_position: float, group_pnl: float, buy_stats: Tuple[int, float, float],
+                              sell_stats: Tuple[int, float, float], group_qty: float, is_open: bool) -> Dict:
+        """
+        거래 구간 하나를 포지션 그룹 데이터로 변환
+        
+        Args:
+            time_strs: (시작 시각, 종료 시각) 'HH:MM:SS' 문자열
+            net_position: 방향 판단 기준 (완료 그룹은 청산 직전, 미완료는 현재 net position)
+            buy_stats, sell_stats: (거래 수, 가격×수량 합계, 수량 합계)
+        """
+        # 포지션 방향 결정 및 진입 거래 (Long은 BUY, Short은 SELL)
+        if net_position > 0:
+            position_side = 'Long'
+            entry_count, total_cost, total_qty = buy_stats
+        else:
+            position_side = 'Short'
+            entry_count, total_cost, total_qty = sell_stats
+        
+        # 평균 진입가 계산
+        if entry_count:
+            avg_entry_price = total_cost / total_qty if total_qty > 0 else float(prices[start])
+        else:
+            avg_entry_price = float(prices[start])
+            total_qty = group_qty
+        
+        # 청산가 (마지막 거래 가격, 미완료 포지션이면 현재가로 사용)
+        exit_price = float(prices[end])
+        
+        # 수익률 계산 (미완료 포지션은 미실현 손익 기반)
+        if position_side == 'Long':
+            pnl_percentage = ((exit_price - avg_entry_price) / avg_entry_price) * 100
+        else:
+            pnl_percentage = ((avg_entry_price - exit_price) / avg_entry_price) * 100
+        
+        # 시간 정보
+        start_time_str, end_time_str = time_strs
+        duration_minutes = (int(times[end]) - int(times[start])) / 60000
+        
+        return {
+            'symbol': symbol,
+            'side': position_side,
+            'entry_price': avg_entry_price,
+            'exit_price': exit_price,
+            'quantity': abs(net_position) if is_open else total_qty,
+            'pnl_amount': group_pnl,
+            'pnl_percentage': pnl_percentage,
+            'start_time': str(start_time_str),
+            'end_time': str(end_time_str),
+            'duration_minutes': duration_minutes,
+            'trade_count': end - start + 1,
+            'position_type': 'Open' if is_open else 'Closed'  # 미완료 포지션 표시
+        }
+
     async def _create_empty_journal(self, target_date: datetime) -> bool:
         """거래 데이터가 없을 때 빈 매매일지 생성"""
         try:
@@ -671,46 +765,28 @@ class EmotionalTradingJournal:
         """API 연결 상태 테스트"""
         logger.info("🔍 API 연결 테스트 시작...")
         
-        # Binance API 테스트
-        try:
-            account_info = await self.binance.test_connection()
-            if account_info:
-                logger.info(f"✅ Binance API 연결 성공")
-                print("✅ Binance API: 연결 성공")
-            else:
-                logger.error("❌ Binance API 연결 실패")
-                print("❌ Binance API: 연결 실패")
-        except Exception as e:
-            logger.error(f"❌ Binance API 연결 오류: {e}")
-            print(f"❌ Binance API: 연결 오류 - {e}")
+        # 각 API 연결 테스트를 동시에 실행
+        services = [
+            ('Binance', self.binance.test_connection()),
+            ('Notion', self.notion_uploader.test_connection())
+        ]
+        if self.supabase:
+            services.append(('Supabase', self.supabase.test_connection()))
         
-        # Notion API 테스트  
-        try:
-            success = await self.notion_uploader.test_connection()
-            if success:
-                logger.info("✅ Notion API 연결 성공")
-                print("✅ Notion API: 연결 성공")
+        results = await asyncio.gather(*(coro for _, coro in services), return_exceptions=True)
+        
+        for (name, _), result in zip(services, results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ {name} API 연결 오류: {result}")
+                print(f"❌ {name} API: 연결 오류 - {result}")
+            elif result:
+                logger.info(f"✅ {name} API 연결 성공")
+                print(f"✅ {name} API: 연결 성공")
             else:
-                logger.error("❌ Notion API 연결 실패")
-                print("❌ Notion API: 연결 실패")
-        except Exception as e:
-            logger.error(f"❌ Notion API 연결 오류: {e}")
-            print(f"❌ Notion API: 연결 오류 - {e}")
+                logger.error(f"❌ {name} API 연결 실패")
+                print(f"❌ {name} API: 연결 실패")
         
-        # Supabase API 테스트
-        if self.supabase:
-            try:
-                success = await self.supabase.test_connection()
-                if success:
-                    logger.info("✅ Supabase API 연결 성공")
-                    print("✅ Supabase API: 연결 성공")
-                else:
-                    logger.error("❌ Supabase API 연결 실패")
-                    print("❌ Supabase API: 연결 실패")
-            except Exception as e:
-                logger.error(f"❌ Supabase API 연결 오류: {e}")
-                print(f"❌ Supabase API: 연결 오류 - {e}")
-        else:
+        if not self.supabase:
             print("⚠️  Supabase API: 설정되지 않음 (선택사항)")
 
     async def _save_daily_pnl_to_supabase(self, target_date: datetime, journal_data: Dict[str, Any]):
@@ -748,6 +824,7 @@ async def main():
             logger.error(f"   - {error}")
         sys.exit(1)
     
+    journal_system = None
     try:
         # 명령행 인수 파싱
         parser = argparse.ArgumentParser(
@@ -756,6 +833,7 @@ async def main():
             epilog="""
 사용 예시:
   python main.py --date 2025-01-15    # 특정 날짜의 매매일지 생성
+  python main.py --start-date 2025-01-01 --end-date 2025-01-15    # 날짜 범위의 매매일지 생성
   python main.py                      # 오늘 날짜의 매매일지 생성
   python main.py --test-connection    # API 연결 테스트
             """
@@ -768,6 +846,20 @@ async def main():
             default=None
         )
         
+        parser.add_argument(
+            '--start-date',
+            type=str,
+            help='범위 생성 시작 날짜 (YYYY-MM-DD 형식, --end-date와 함께 사용)',
+            default=None
+        )
+        
+        parser.add_argument(
+            '--end-date',
+            type=str,
+            help='범위 생성 종료 날짜 (YYYY-MM-DD 형식, --start-date와 함께 사용)',
+            default=None
+        )
+        
         parser.add_argument(
             '--test-connection', '-t',
             action='store_true',
@@ -784,6 +876,31 @@ async def main():
             await journal_system.test_api_connections()
             return
         
+        # 날짜 범위 모드 (클라이언트 초기화를 한 번만 하고 날짜별 작업을 겹쳐 실행)
+        if args.start_date or args.end_date:
+            if not (args.start_date and args.end_date):
+                logger.error("❌ --start-date와 --end-date를 함께 지정해주세요.")
+                sys.exit(1)
+            try:
+                start_date = datetime.strptime(args.start_date, '%Y-%m-%d')
+                end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
+            except ValueError:
+                logger.error("❌ 날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용해주세요.")
+                sys.exit(1)
+            if end_date < start_date:
+                logger.error("❌ 종료 날짜가 시작 날짜보다 앞설 수 없습니다.")
+                sys.exit(1)
+            
+            logger.info(f"📅 분석 기간: {start_date.strftime('%Y년 %m월 %d일')} ~ {end_date.strftime('%Y년 %m월 %d일')}")
+            failed_dates = await journal_system.run_pipeline_for_range(start_date, end_date)
+            
+            if not failed_dates:
+                print("🎉 모든 날짜의 매매일지가 성공적으로 생성되어 Notion에 업로드되었습니다!")
+            else:
+                print(f"❌ {len(failed_dates)}일 매매일지 생성 실패: {', '.join(d.strftime('%Y-%m-%d') for d in failed_dates)}")
+                sys.exit(1)
+            return
+        
         # 날짜 설정
         if args.date:
             try:
@@ -814,6 +931,9 @@ async def main():
         logger.error(f"❌ 예상치 못한 오류가 발생했습니다: {e}")
         print(f"❌ 오류: {e}")
         sys.exit(1)
+    finally:
+        if journal_system:
+            await journal_system.close()
 
 if __name__ == "__main__":
     # 로깅 설정
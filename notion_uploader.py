@@ -1,45 +1,187 @@
 import os
 import asyncio
-import requests
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import hashlib
+import json
+import random
+import aiohttp
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 import logging
-from notion_client import Client
 from config import Config
 from utils import logger, format_percentage, format_korean_won
 
+try:
+    import orjson  # 요청 본문 직렬화 가속 (없으면 표준 json 사용)
+except ImportError:
+    orjson = None
+
+# Notion REST API
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_API_VERSION = "2022-06-28"
+
+# Notion 요청 한도 (공식 제한: 초당 평균 3회)
+NOTION_MAX_CONCURRENT_REQUESTS = 3
+NOTION_REQUESTS_PER_SECOND = 3
+
+# 일시적 오류(429, 5xx, 네트워크) 재시도 횟수 (첫 시도 포함)
+NOTION_MAX_ATTEMPTS = 3
+
+
+def _dumps_body(body: Dict[str, Any]) -> bytes:
+    """요청 본문 JSON 직렬화 (UTF-8 그대로, numpy 숫자 포함)"""
+    if orjson is not None:
+        return orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(body, ensure_ascii=False).encode('utf-8')
+
+
+def _loads_body(raw: bytes) -> Dict[str, Any]:
+    """응답 본문 JSON 파싱"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _position_table_key(positions: List[Dict[str, Any]]) -> tuple:
+    """포지션 표에 표시되는 값만 모은 키 (같으면 같은 표가 만들어짐)"""
+    return len(positions), tuple(
+        (
+            pos['symbol'], pos['side'], pos.get('trade_count', 1), pos['pnl_percentage'],
+            pos.get('pnl_amount', 0), pos.get('actual_pnl'), pos.get('commission', 0),
+            pos.get('entry_time', ''), pos.get('exit_time', ''), pos.get('duration', '')
+        )
+        for pos in positions[:20]
+    )
+
+
+class NotionAPIError(Exception):
+    """Notion API 오류 응답"""
+    
+    def __init__(self, status: int, body: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"Notion API 오류 {status}: {body}")
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+@lru_cache(maxsize=512)
+def _long_date_str(day: date) -> str:
+    """로그용 날짜 문자열 (August 4, 2025), 날짜별로 한 번만 포맷"""
+    return day.strftime('%B %d, %Y')
+
+
+def _cell(text: str) -> List[Dict[str, Any]]:
+    """표 셀 (텍스트 하나)"""
+    return [{"type": "text", "text": {"content": text}}]
+
+
+# 포지션 표 헤더 행 (매번 새로 만들 필요 없는 고정 데이터)
+_POSITION_TABLE_HEADER = {
+    "type": "table_row",
+    "table_row": {
+        "cells": [
+            _cell(column)
+            for column in ("종목", "방향", "거래횟수", "수익률", "실손익", "순수익", "수수료", "진입시점", "종료시점", "보유기간")
+        ]
+    }
+}
+
+
+def _position_table_row(pos: Dict[str, Any]) -> Dict[str, Any]:
+    """포지션 하나를 표 행으로 변환 (필드는 한 번씩만 조회)"""
+    # 실제 수수료 데이터 사용
+    pure_pnl = float(pos.get('pnl_amount', 0))  # 순수익 (가격 차익)
+    actual_pnl = pos.get('actual_pnl', pure_pnl)  # 실손익
+    commission = pos.get('commission', 0)  # 실제 수수료
+    
+    # 수익금에 따른 아이콘 결정 (초록: 수익, 빨강: 손실, 흰색: 무손익)
+    symbol_icon = "🟢" if pure_pnl > 0 else "🔴" if pure_pnl < 0 else "⚪"
+    
+    return {
+        "type": "table_row",
+        "table_row": {
+            "cells": [
+                _cell(f"{symbol_icon} {pos['symbol']}"),
+                _cell(pos['side']),
+                _cell(f"{pos.get('trade_count', 1)}회"),
+                _cell(f"{pos['pnl_percentage']:+.2f}%"),
+                _cell(f"{actual_pnl:+.4f} USDT"),
+                _cell(f"{pure_pnl:+.4f} USDT"),
+                _cell(f"-{commission:.4f} USDT"),
+                _cell(pos.get('entry_time', '')),
+                _cell(pos.get('exit_time', '')),
+                _cell(pos.get('duration', ''))
+            ]
+        }
+    }
+
+
 class NotionUploader:
     """감성적인 매매일지를 위한 Notion API 연동 클래스"""
     
+    # 프로세스 안에서 공유하는 데이터베이스 스키마 (연결 테스트 결과)
+    _schema_cache: Dict[str, Dict[str, Any]] = {}
+    
     def __init__(self):
         """초기화"""
-        self.client = Client(auth=Config.NOTION_TOKEN)
+        # 비동기 REST 호출용 (이벤트 루프 안에서 지연 생성)
+        self._session: Optional[aiohttp.ClientSession] = None
         self.database_id = Config.NOTION_DATABASE_ID
+        
+        # 페이지 내용 지문 (속성 이름이 설정된 경우에만 사용)
+        self.fingerprint_property = Config.NOTION_FINGERPRINT_PROPERTY
+        self._page_fingerprints: Dict[str, str] = {}
+        
+        # 페이지별 마지막으로 보낸 속성 (업데이트 시 바뀐 속성만 전송)
+        self._page_properties: Dict[str, Dict[str, Any]] = {}
+        
+        # 기존 페이지 내용 교체 방식 (batch_delete / archive_recreate)
+        self.update_strategy = Config.NOTION_UPDATE_STRATEGY
+        
+        # 날짜별 페이지 ID 캐시 (페이지가 없으면 None, 프로세스 동안 유지)
+        self._page_id_cache: Dict[date, Optional[str]] = {}
+        
+        # 날짜별 마지막 포지션 표 (표에 표시되는 값이 같으면 재사용)
+        self._table_cache: Dict[date, Tuple[tuple, List[Dict[str, Any]]]] = {}
+        
+        # 모든 Notion 요청이 _notion_call을 거치므로 동시 요청 수와 초당 요청 수를 함께 제한
+        self._req_sem = asyncio.Semaphore(NOTION_MAX_CONCURRENT_REQUESTS)
+        self._rate_lock = asyncio.Lock()
+        self._next_request_at = 0.0
         logger.info("감성적인 Notion 업로더 초기화 완료")
 
     async def find_existing_page_for_date(self, target_date: datetime) -> Optional[str]:
         """특정 날짜의 기존 페이지 검색"""
+        cache_key = target_date.date()
+        if cache_key in self._page_id_cache:
+            return self._page_id_cache[cache_key]
+        
         try:
             # 날짜 포맷 (August 4, 2025)
-            date_str = target_date.strftime('%B %d, %Y')
+            date_str = _long_date_str(cache_key)
             
             # 데이터베이스에서 해당 날짜의 페이지 검색
-            response = self.client.databases.query(
-                database_id=self.database_id,
-                filter={
+            response = await self._notion_call('POST', f"/databases/{self.database_id}/query", {
+                "filter": {
                     "property": "Date",
                     "date": {
-                        "equals": target_date.strftime('%Y-%m-%d')
+                        "equals": cache_key.isoformat()
                     }
                 }
-            )
+            })
             
             if response['results']:
-                page_id = response['results'][0]['id']
+                page = response['results'][0]
+                page_id = page['id']
+                # 조회 결과에 포함된 내용 지문을 기억 (추가 조회 없이 변경 여부 판단)
+                if self.fingerprint_property:
+                    self._page_fingerprints[page_id] = self._read_fingerprint(page)
                 logger.info(f"기존 페이지 발견: {page_id} ({date_str})")
+                self._page_id_cache[cache_key] = page_id
                 return page_id
             else:
                 logger.info(f"기존 페이지 없음 - 새로 생성: {date_str}")
+                self._page_id_cache[cache_key] = None
                 return None
                 
         except Exception as e:
@@ -54,31 +196,44 @@ class NotionUploader:
             
             # 페이지 내용 완전 교체
             content = await self._build_emotional_content(journal_data)
+            fingerprint = self._attach_fingerprint(properties, content)
+            
+            # 내용이 이전 업로드와 같으면 블록은 그대로 두고 속성만 업데이트
+            if fingerprint and self._page_fingerprints.get(page_id) == fingerprint:
+                await self._update_page_properties(page_id, properties)
+                logger.info(f"페이지 내용 변경 없음 - 속성만 업데이트: {page_id}")
+                return True
             
             # 기존 내용 삭제 후 새 내용 추가
             # 먼저 기존 children 가져오기
-            children_response = self.client.blocks.children.list(block_id=page_id)
+            children_response = await self.list_block_children(page_id)
+            existing_blocks = children_response['results']
+            
+            # 블록이 많으면 하나씩 지우는 대신 페이지를 보관하고 새로 생성 (요청 2회)
+            if self.update_strategy == 'archive_recreate' and len(existing_blocks) > Config.NOTION_ARCHIVE_MIN_BLOCKS:
+                await self._notion_call('PATCH', f"/pages/{page_id}", {"archived": True})
+                self._page_properties.pop(page_id, None)
+                self._page_fingerprints.pop(page_id, None)
+                
+                target_date = journal_data.get('date', datetime.now())
+                new_page_id = await self._create_page(target_date.date(), properties, content)
+                if fingerprint:
+                    self._page_fingerprints[new_page_id] = fingerprint
+                logger.info(f"기존 페이지 보관 후 새로 생성: {page_id} → {new_page_id}")
+                return True
             
-            # 기존 블록들 삭제
-            for block in children_response['results']:
-                try:
-                    self.client.blocks.delete(block_id=block['id'])
-                except:
-                    pass  # 일부 블록은 삭제 불가능할 수 있음
+            # 기존 블록들 동시에 삭제
+            await self.delete_blocks([block['id'] for block in existing_blocks])
             
             # 속성 업데이트
-            self.client.pages.update(
-                page_id=page_id,
-                properties=properties
-            )
+            await self._update_page_properties(page_id, properties)
             
             # 새 내용 추가
             if content:
-                self.client.blocks.children.append(
-                    block_id=page_id,
-                    children=content
-                )
+                await self.append_block_children(page_id, content)
             
+            if fingerprint:
+                self._page_fingerprints[page_id] = fingerprint
             logger.info(f"기존 페이지 업데이트 완료: {page_id}")
             return True
             
@@ -86,6 +241,139 @@ class NotionUploader:
             logger.error(f"페이지 업데이트 중 오류: {e}")
             return False
 
+    async def _create_page(self, day: date, properties: Dict[str, Any], children: List[Dict[str, Any]]) -> str:
+        """데이터베이스에 새 페이지 생성 후 캐시 갱신, 페이지 ID 반환"""
+        response = await self._notion_call('POST', "/pages", {
+            "parent": {"database_id": self.database_id},
+            "properties": properties,
+            "children": children
+        }, idempotent=False)
+        
+        # 새로 만든 페이지 ID로 캐시 갱신 (다음 호출은 업데이트 경로로)
+        self._page_id_cache[day] = response['id']
+        self._page_properties[response['id']] = properties
+        return response['id']
+
+    async def _update_page_properties(self, page_id: str, properties: Dict[str, Any]):
+        """페이지 속성 업데이트 (이 프로세스에서 마지막으로 보낸 값과 다른 속성만 전송)"""
+        sent = self._page_properties.get(page_id, {})
+        changed = {name: value for name, value in properties.items() if sent.get(name) != value}
+        if not changed:
+            logger.info(f"페이지 속성 변경 없음 - 업데이트 생략: {page_id}")
+            return
+        
+        await self._notion_call('PATCH', f"/pages/{page_id}", {"properties": changed})
+        self._page_properties[page_id] = {**sent, **changed}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """aiohttp 세션 반환 (없거나 닫혔으면 새로 생성)"""
+        if self._session is None or self._session.closed:
+            # keep-alive 커넥션 풀: 동시 삭제/추가 요청이 같은 연결을 재사용
+            connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={
+                    'Authorization': f"Bearer {Config.NOTION_TOKEN}",
+                    'Notion-Version': NOTION_API_VERSION,
+                    'Content-Type': 'application/json'
+                }
+            )
+        return self._session
+
+    async def _wait_rate_limit(self):
+        """초당 요청 수 제한 (요청 시작 간격을 일정하게 유지)"""
+        async with self._rate_lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1 / NOTION_REQUESTS_PER_SECOND
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _request_once(self, method: str, path: str, data: Optional[bytes]) -> Dict[str, Any]:
+        """Notion REST API 단일 요청"""
+        session = await self._get_session()
+        
+        # 초당 한도를 먼저 기다린 뒤 동시 요청 슬롯을 잡아 슬롯이 대기 시간에 묶이지 않도록 함
+        await self._wait_rate_limit()
+        async with self._req_sem:
+            async with session.request(method, f"{NOTION_API_URL}{path}", data=data) as response:
+                raw = await response.read()
+                if response.status >= 400:
+                    raise NotionAPIError(response.status, raw.decode('utf-8', 'replace'), dict(response.headers))
+        return _loads_body(raw)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int, idempotent: bool = True) -> Optional[float]:
+        """재시도 대기 시간 (재시도하지 않을 오류면 None)
+        
+        429는 Notion이 요청을 처리하지 않은 것이 보장되므로 항상 재시도하고,
+        5xx/네트워크 오류는 응답만 유실되었을 수 있으므로 멱등 요청만 재시도
+        (페이지 생성/블록 추가를 재시도하면 중복 페이지/블록이 생길 수 있음)
+        """
+        backoff = 2 ** attempt + random.uniform(0, 0.5)
+        if isinstance(error, NotionAPIError):
+            if error.status == 429:
+                try:
+                    return float(error.headers.get('Retry-After', backoff))
+                except (TypeError, ValueError):
+                    return backoff
+            if error.status >= 500:
+                return backoff if idempotent else None
+            # 나머지 4xx는 요청 자체의 문제이므로 그대로 전달
+            return None
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return backoff if idempotent else None
+        return None
+
+    async def _notion_call(self, method: str, path: str, body: Optional[Dict[str, Any]] = None,
+                           idempotent: bool = True) -> Dict[str, Any]:
+        """Notion REST API 호출 (이벤트 루프를 막지 않음, 일시적 오류는 지수 백오프로 재시도)
+        
+        idempotent=False인 요청(페이지 생성, 블록 추가)은 429에서만 재시도
+        """
+        data = _dumps_body(body) if body is not None else None
+        
+        for attempt in range(NOTION_MAX_ATTEMPTS):
+            try:
+                return await self._request_once(method, path, data)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent)
+                if delay is None or attempt == NOTION_MAX_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Notion 요청 재시도 (시도 {attempt + 1}/{NOTION_MAX_ATTEMPTS} 실패, {delay:.1f}초 후): {method} {path} - {e}")
+                await asyncio.sleep(delay)
+
+    async def list_block_children(self, block_id: str) -> Dict[str, Any]:
+        """블록(페이지)의 하위 블록 조회"""
+        return await self._notion_call('GET', f"/blocks/{block_id}/children")
+
+    async def append_block_children(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """블록(페이지)에 하위 블록 추가"""
+        return await self._notion_call('PATCH', f"/blocks/{block_id}/children", {"children": children}, idempotent=False)
+
+    async def close(self):
+        """aiohttp 세션 정리"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def delete_blocks(self, block_ids: List[str]) -> int:
+        """블록들을 동시에 삭제 (요청 한도는 _notion_call에서 제한), 삭제된 블록 수 반환"""
+        results = await asyncio.gather(
+            *(self._notion_call('DELETE', f"/blocks/{block_id}") for block_id in block_ids),
+            return_exceptions=True
+        )
+        
+        deleted = 0
+        for block_id, result in zip(block_ids, results):
+            if isinstance(result, Exception):
+                # 일부 블록은 삭제 불가능할 수 있음
+                logger.warning(f"블록 삭제 실패 ({block_id}): {result}")
+            else:
+                deleted += 1
+        return deleted
+
     async def create_emotional_journal_page(self, journal_data: Dict[str, Any]) -> bool:
         """감성적인 매매일지 페이지 생성 또는 업데이트 (하루에 하나만)
         
@@ -108,7 +396,9 @@ class NotionUploader:
                 logger.info("📝 기존 페이지를 업데이트합니다...")
                 success = await self.update_existing_page(existing_page_id, journal_data)
                 if success:
-                    page_url = f"https://www.notion.so/{existing_page_id.replace('-', '')}"
+                    # archive_recreate로 새 페이지가 만들어졌을 수 있으므로 캐시된 ID 사용
+                    page_id = self._page_id_cache.get(target_date.date()) or existing_page_id
+                    page_url = f"https://www.notion.so/{page_id.replace('-', '')}"
                     logger.info(f"페이지 URL: {page_url}")
                 return success
             else:
@@ -120,16 +410,13 @@ class NotionUploader:
                 
                 # 페이지 내용 구성
                 children = await self._build_emotional_content(journal_data)
+                self._attach_fingerprint(properties, children)
             
             # Notion 페이지 생성
-            response = self.client.pages.create(
-                parent={"database_id": self.database_id},
-                properties=properties,
-                children=children
-            )
+            page_id = await self._create_page(target_date.date(), properties, children)
             
-            logger.info(f"감성적인 매매일지 페이지 생성 완료: {response['id']}")
-            page_url = f"https://www.notion.so/{response['id'].replace('-', '')}"
+            logger.info(f"감성적인 매매일지 페이지 생성 완료: {page_id}")
+            page_url = f"https://www.notion.so/{page_id.replace('-', '')}"
             logger.info(f"페이지 URL: {page_url}")
             
             return True
@@ -141,44 +428,46 @@ class NotionUploader:
     def _build_emotional_properties(self, journal_data: Dict[str, Any]) -> Dict[str, Any]:
         """감성적인 매매일지 페이지 속성 구성"""
         try:
-            daily_summary = journal_data.get('daily_summary', {})
-            target_date = journal_data.get('date', datetime.now())
-            
-            # 날짜 포맷팅 (August 2, 2025 형태)
-            formatted_date = target_date.strftime('%B %d, %Y')
+            get = journal_data.get
+            target_date = get('date', datetime.now())
+            title = get('title', '오늘의 매매일지')
+            rate_stars = self._convert_rate_to_stars(get('emotional_rate', 3))
+            market_type = get('market_type', '횡보장')
+            difficulty_level = get('difficulty_level', '중')
+            daily_pnl_usd = get('daily_summary', {}).get('daily_pnl_usd', 0.0)
             
             properties = {
                 "Name": {
                     "title": [
                         {
                             "text": {
-                                "content": journal_data.get('title', '오늘의 매매일지')
+                                "content": title
                             }
                         }
                     ]
                 },
                 "Date": {
                     "date": {
-                        "start": target_date.strftime('%Y-%m-%d')
+                        "start": target_date.date().isoformat()
                     }
                 },
                 "Rate": {
                     "select": {
-                        "name": self._convert_rate_to_stars(journal_data.get('emotional_rate', 3))
+                        "name": rate_stars
                     }
                 },
                 "Type": {
                     "select": {
-                        "name": journal_data.get('market_type', '횡보장')
+                        "name": market_type
                     }
                 },
                 "Level": {
                     "select": {
-                        "name": journal_data.get('difficulty_level', '중')
+                        "name": difficulty_level
                     }
                 },
                 "수익금": {
-                    "number": round(daily_summary.get('daily_pnl_usd', 0.0), 2)
+                    "number": round(daily_pnl_usd, 2)
                 }
             }
             
@@ -198,27 +487,32 @@ class NotionUploader:
                 }
             }
 
+    def _attach_fingerprint(self, properties: Dict[str, Any], content: List[Dict[str, Any]]) -> Optional[str]:
+        """페이지 내용 지문을 계산해 속성에 추가 (지문 속성이 설정되지 않았으면 None)"""
+        if not self.fingerprint_property:
+            return None
+        
+        payload = json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+        fingerprint = hashlib.sha1(payload.encode()).hexdigest()
+        properties[self.fingerprint_property] = {
+            "rich_text": [{"text": {"content": fingerprint}}]
+        }
+        return fingerprint
+
+    def _read_fingerprint(self, page: Dict[str, Any]) -> str:
+        """페이지 객체에서 저장된 내용 지문 읽기"""
+        rich_text = page.get('properties', {}).get(self.fingerprint_property, {}).get('rich_text', [])
+        return ''.join(text.get('plain_text', '') for text in rich_text)
+
+    # 중요도 Rate(0~5)별 별 아이콘 (0은 별 없음)
+    _STAR_TABLE = ("-", "⭐", "⭐⭐", "⭐⭐⭐", "⭐⭐⭐⭐", "⭐⭐⭐⭐⭐")
+
     def _convert_rate_to_stars(self, rate: int) -> str:
         """중요도 Rate를 별 아이콘 개수로 변환 (0~5개)"""
         try:
             # 0~5 범위로 제한
-            rate = max(0, min(5, int(rate)))
-            
-            # 별 아이콘으로 변환
-            if rate == 0:
-                return "-"  # 별 없음
-            elif rate == 1:
-                return "⭐"      # 별 1개
-            elif rate == 2:
-                return "⭐⭐"    # 별 2개
-            elif rate == 3:
-                return "⭐⭐⭐"  # 별 3개
-            elif rate == 4:
-                return "⭐⭐⭐⭐"  # 별 4개
-            else:  # rate == 5
-                return "⭐⭐⭐⭐⭐"  # 별 5개
-                
-        except Exception as e:
+            return self._STAR_TABLE[max(0, min(5, int(rate)))]
+        except (TypeError, ValueError) as e:
             logger.error(f"Rate 변환 중 오류: {e}")
             return "⭐⭐⭐"  # 기본값
 
@@ -231,8 +525,8 @@ class NotionUploader:
             # 1. 매매 요약 섹션
             children.extend(self._create_trading_summary_section(daily_summary))
             
-            # 2. 포지션별 상세 내역
-            children.extend(self._create_position_table_section(journal_data))
+            # 2. 포지션별 상세 내역 (요약만 바뀐 재실행이면 이전 표 재사용)
+            children.extend(self._cached_position_table_section(journal_data))
             
             return children
             
@@ -255,20 +549,38 @@ class NotionUploader:
                 }
             ]
 
+    def _cached_position_table_section(self, journal_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """포지션 표 섹션 (같은 날짜에 표에 표시되는 값이 그대로면 캐시 사용)"""
+        target_date = journal_data.get('date')
+        try:
+            table_key = _position_table_key(journal_data.get('positions', []))
+        except (KeyError, TypeError):
+            # 필드가 빠진 포지션은 캐시 없이 생성 (오류 처리는 표 생성 쪽에서)
+            return self._create_position_table_section(journal_data)
+        
+        day = target_date.date() if target_date else None
+        cached = self._table_cache.get(day)
+        if cached and cached[0] == table_key:
+            return cached[1]
+        
+        table_section = self._create_position_table_section(journal_data)
+        if table_section and day:
+            self._table_cache[day] = (table_key, table_section)
+        return table_section
+
     def _create_trading_summary_section(self, daily_summary: Dict[str, Any]) -> List[Dict[str, Any]]:
         """매매 요약 섹션 생성 (Daily P&L 기반)"""
         try:
             # Daily P&L 기반 정확한 하루 손익 데이터
-            daily_pnl_usd = daily_summary.get('daily_pnl_usd', 0)
-            daily_pnl_krw = daily_summary.get('daily_pnl_krw', 0)
-            daily_percentage = daily_summary.get('daily_pnl_percentage', 0)
-            trade_count = daily_summary.get('trade_count', 0)
-            position_count = daily_summary.get('position_count', 0)
-            date = daily_summary.get('date', '오늘')
+            # (표시에 쓰는 값만 한 번씩 조회)
+            get = daily_summary.get
+            daily_pnl_usd = get('daily_pnl_usd', 0)
+            daily_percentage = get('daily_pnl_percentage', 0)
+            trading_volume = get('trading_volume', 0)
+            position_count = get('position_count', 0)
             
             # 손익에 따른 이모지 선택
             profit_emoji = "📈" if daily_pnl_usd >= 0 else "📉"
-            money_emoji = "💰" if daily_pnl_usd >= 0 else "💸"
             
             return [
                 # {
@@ -312,7 +624,7 @@ class NotionUploader:
                                         {
                                             "type": "text",
                                             "text": {
-                                                "content": f"💱 거래량: {daily_summary.get('trading_volume', 0):.2f} USDT"
+                                                "content": f"💱 거래량: {trading_volume:.2f} USDT"
                                             }
                                         }
                                     ]
@@ -365,64 +677,11 @@ class NotionUploader:
                 })
                 return sections
             
-            # 표 헤더 생성
-            table_rows = [
-                {
-                    "type": "table_row",
-                    "table_row": {
-                        "cells": [
-                            [{"type": "text", "text": {"content": "종목"}}],
-                            [{"type": "text", "text": {"content": "방향"}}],
-                            [{"type": "text", "text": {"content": "거래횟수"}}],
-                            [{"type": "text", "text": {"content": "수익률"}}],
-                            [{"type": "text", "text": {"content": "실손익"}}],
-                            [{"type": "text", "text": {"content": "순수익"}}],
-                            [{"type": "text", "text": {"content": "수수료"}}],
-                            [{"type": "text", "text": {"content": "진입시점"}}],
-                            [{"type": "text", "text": {"content": "종료시점"}}],
-                            [{"type": "text", "text": {"content": "보유기간"}}]
-                            ]
-                        }
-                }
-            ]
+            # 표 헤더 (고정 행이라 모듈 상수를 그대로 사용, 요청 본문은 직렬화만 하므로 변경되지 않음)
+            table_rows = [_POSITION_TABLE_HEADER]
             
             # 포지션 데이터 행 추가 (최대 20개까지)
-            for pos in positions[:20]:
-                # 수익금에 따른 아이콘 결정
-                pnl_amount = float(pos.get('pnl_amount', 0))
-                if pnl_amount > 0:
-                    symbol_icon = "🟢"  # 초록색 동그라미 (수익)
-                elif pnl_amount < 0:
-                    symbol_icon = "🔴"  # 빨간색 동그라미 (손실)
-                else:
-                    symbol_icon = "⚪"  # 흰색 동그라미 (무손익)
-                
-                # 종목명에 아이콘 추가
-                symbol_name = f"{symbol_icon} {pos['symbol']}"
-                
-                # 실제 수수료 데이터 사용
-                trade_count = pos.get('trade_count', 1)
-                commission = pos.get('commission', 0)  # 실제 수수료
-                pure_pnl = float(pos.get('pnl_amount', 0))  # 순수익 (가격 차익)
-                actual_pnl = pos.get('actual_pnl', pure_pnl)  # 실손익
-                
-                table_rows.append({
-                    "type": "table_row",
-                    "table_row": {
-                        "cells": [
-                            [{"type": "text", "text": {"content": symbol_name}}],
-                            [{"type": "text", "text": {"content": pos['side']}}],
-                            [{"type": "text", "text": {"content": f"{trade_count}회"}}],
-                            [{"type": "text", "text": {"content": f"{pos['pnl_percentage']:+.2f}%"}}],
-                            [{"type": "text", "text": {"content": f"{actual_pnl:+.4f} USDT"}}],
-                            [{"type": "text", "text": {"content": f"{pure_pnl:+.4f} USDT"}}],
-                            [{"type": "text", "text": {"content": f"-{commission:.4f} USDT"}}],
-                            [{"type": "text", "text": {"content": pos.get('entry_time', '')}}],
-                            [{"type": "text", "text": {"content": pos.get('exit_time', '')}}],
-                            [{"type": "text", "text": {"content": pos.get('duration', '')}}]
-                        ]
-                    }
-                })
+            table_rows.extend([_position_table_row(pos) for pos in positions[:20]])
                 
             # 표 블록 추가
             sections.append({
@@ -466,11 +725,14 @@ class NotionUploader:
 
 
 
-    def test_connection(self) -> bool:
+    async def test_connection(self) -> bool:
         """Notion API 연결 테스트"""
         try:
-            # 데이터베이스 정보 조회로 연결 테스트
-            self.client.databases.retrieve(database_id=self.database_id)
+            # 데이터베이스 정보 조회로 연결 테스트 (이미 확인한 데이터베이스는 생략)
+            if self.database_id not in self._schema_cache:
+                self._schema_cache[self.database_id] = await self._notion_call(
+                    'GET', f"/databases/{self.database_id}"
+                )
             logger.info("Notion API 연결 테스트 성공")
             return True
         except Exception as e:
@@ -7,14 +7,69 @@ Supabase 거래 데이터를 포지션 그룹으로 변환하는 스크립트
 
 import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 from supabase_manager import SupabaseManager
-from utils import setup_logging
+from utils import setup_logging, gather_or_cancel
 
 # 로거 설정
 setup_logging()
 
+# 포지션 완료로 보는 Net Position 허용 오차 (소수점 오차)
+NET_POSITION_EPSILON = 0.0001
+
+# Net Position 누적 시 수량을 정수로 바꾸는 배율 (바이낸스 수량 최소 단위 1e-8)
+QTY_SCALE = 10 ** 8
+
+# 동시에 그룹화할 최대 종목 수 (워커 스레드에서 실행)
+MAX_CONCURRENT_SYMBOLS = 8
+
+# 종목별 거래 배열 형식 (side: BUY=1, SELL=0)
+TRADE_DTYPE = np.dtype([('time', 'i8'), ('price', 'f8'), ('qty', 'f8'), ('side', 'u1')])
+
+
+def _find_close_indices(signed_qtys: np.ndarray, eps: float = NET_POSITION_EPSILON) -> np.ndarray:
+    """누적 Net Position이 0에 가까워지는 거래 인덱스 (포지션 완료 지점) 반환
+    
+    완료 지점마다 Net Position을 0으로 초기화한 것과 같은 결과를 반환
+    (수량을 정수 단위로 바꿔 누적하므로 긴 하루 동안 소수점 오차가 쌓이지 않음)
+    """
+    net_units = np.cumsum(np.rint(signed_qtys * QTY_SCALE).astype(np.int64))
+    eps_units = int(round(eps * QTY_SCALE))
+    
+    # 잔량 없이 완료되는 동안은 누적값이 0 근처인 지점이 곧 완료 지점 (벡터 연산 한 번)
+    hits = np.flatnonzero(np.abs(net_units) < eps_units)
+    with_residue = np.flatnonzero(net_units[hits] != 0)
+    if not len(with_residue):
+        return hits
+    
+    # 잔량이 남은 첫 완료 지점 이후는 직전 완료 지점의 누적값(base) 기준으로 한 번만 순회
+    first = int(hits[with_residue[0]])
+    closes = hits[:with_residue[0] + 1].tolist()
+    base = int(net_units[first])
+    for i, net in enumerate(net_units[first + 1:].tolist(), first + 1):
+        if -eps_units < net - base < eps_units:
+            closes.append(i)
+            base = net
+    return np.array(closes, dtype=np.int64)
+
+
+def _scan_net_position(trades: np.ndarray):
+    """거래 배열의 포지션 완료 지점 탐색
+    
+    Returns:
+        (완료 지점 인덱스, 미완료 구간 시작 인덱스, 미완료 구간 Net Position)
+    """
+    signed_qtys = np.where(trades['side'].astype(bool), trades['qty'], -trades['qty'])
+    group_ends = _find_close_indices(signed_qtys)
+    
+    # 마지막 완료 지점 이후 남은 거래 (완료 지점의 미세 잔량은 제외한 Net Position)
+    open_start = int(group_ends[-1]) + 1 if len(group_ends) else 0
+    current_net_position = float(signed_qtys[open_start:].sum())
+    return group_ends, open_start, current_net_position
+
 class PositionGrouper:
     """거래 데이터를 포지션 그룹으로 변환"""
 
@@ -28,46 +83,69 @@ class PositionGrouper:
         try:
             logging.info("🚀 전체 포지션 그룹화 시작...")
             
-            # 1. 거래 데이터 조회 (날짜 범위 지정 가능)
+            # 1. 거래 데이터를 페이지 단위로 조회하면서 바로 종목별로 그룹핑 (날짜 범위 지정 가능)
+            # 페이지가 시간순으로 오므로 종목별 목록도 시간순이 되어 다시 정렬할 필요 없음
+            start_time = end_time = None
             if target_date:
                 # 9시 기준으로 해당 날짜의 거래만 조회
                 start_time = target_date.replace(hour=9, minute=0, second=0, microsecond=0)
                 end_time = start_time + timedelta(days=1)
-                all_trades = await self.supabase.get_all_trades(start_time, end_time)
-                logging.info(f"📊 {target_date.date()} (9시 기준) 거래 데이터: {len(all_trades)}개")
+            
+            trade_count = 0
+            trades_by_symbol = defaultdict(list)
+            async for page in self.supabase.iter_trades(start_time, end_time):
+                trade_count += len(page)
+                for trade in page:
+                    # 수량/가격/시간은 여기서 한 번만 숫자로 변환 (이후 계산은 변환 없이 사용)
+                    trades_by_symbol[trade['symbol']].append(
+                        (int(trade['time']), float(trade['price']), float(trade['qty']), trade['side'] == 'BUY')
+                    )
+            
+            if target_date:
+                logging.info("📊 %s (9시 기준) 거래 데이터: %d개", target_date.date(), trade_count)
             else:
-                # 전체 거래 데이터 조회
-                all_trades = await self.supabase.get_all_trades()
-                logging.info(f"📊 총 {len(all_trades)}개 거래 데이터 로드 완료")
+                logging.info("📊 총 %d개 거래 데이터 로드 완료", trade_count)
             
-            if not all_trades:
+            if not trade_count:
                 logging.warning("❌ 거래 데이터가 없습니다.")
                 return
             
-            # 2. 종목별로 그룹핑
-            trades_by_symbol = {}
-            for trade in all_trades:
-                symbol = trade['symbol']
-                if symbol not in trades_by_symbol:
-                    trades_by_symbol[symbol] = []
-                trades_by_symbol[symbol].append(trade)
+            # 종목별 거래를 연속 배열로 변환 (그룹화 계산은 배열 연산으로 처리)
+            trades_by_symbol = {
+                symbol: np.array(symbol_trades, dtype=TRADE_DTYPE)
+                for symbol, symbol_trades in trades_by_symbol.items()
+            }
             
-            logging.info(f"🏷️ {len(trades_by_symbol)}개 종목 발견: {list(trades_by_symbol.keys())}")
+            # INFO 로그가 꺼져 있으면 종목 목록을 만들지 않음 (이하 INFO 로그는 지연 포맷팅)
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("🏷️ %d개 종목 발견: %s", len(trades_by_symbol), list(trades_by_symbol.keys()))
             
-            # 3. 각 종목별 포지션 그룹화
-            all_position_groups = []
-            for symbol, symbol_trades in trades_by_symbol.items():
-                logging.info(f"🔄 {symbol} 포지션 그룹화 시작... ({len(symbol_trades)}개 거래)")
-                
-                position_groups = await self._group_trades_by_net_position(symbol, symbol_trades, target_date)
-                all_position_groups.extend(position_groups)
-                
-                logging.info(f"✅ {symbol}: {len(position_groups)}개 포지션 생성")
+            # 3. 각 종목별 포지션 그룹화 (종목끼리 독립적이므로 워커 스레드에서 동시에 실행해 이벤트 루프를 막지 않음)
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SYMBOLS)
+            
+            async def group_symbol(symbol: str, symbol_trades: np.ndarray) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    logging.info("🔄 %s 포지션 그룹화 시작... (%d개 거래)", symbol, len(symbol_trades))
+                    try:
+                        position_groups = await asyncio.to_thread(
+                            self._group_trades_by_net_position, symbol, symbol_trades, target_date
+                        )
+                    except Exception as e:
+                        # 한 종목이라도 실패하면 일부만 저장하지 않도록 전체 그룹화를 중단
+                        logging.error(f"❌ {symbol} 포지션 그룹화 실패: {e}")
+                        raise
+                logging.info("✅ %s: %d개 포지션 생성", symbol, len(position_groups))
+                return position_groups
+            
+            results = await gather_or_cancel(
+                *(group_symbol(symbol, symbol_trades) for symbol, symbol_trades in trades_by_symbol.items())
+            )
+            all_position_groups = [group for position_groups in results for group in position_groups]
             
             # 4. Supabase에 저장
             if all_position_groups:
                 await self.supabase.save_position_groups(all_position_groups)
-                logging.info(f"🎉 총 {len(all_position_groups)}개 포지션 그룹 저장 완료!")
+                logging.info("🎉 총 %d개 포지션 그룹 저장 완료!", len(all_position_groups))
             else:
                 logging.warning("❌ 생성된 포지션 그룹이 없습니다.")
                 
@@ -77,160 +155,126 @@ class PositionGrouper:
             logging.error(f"❌ 포지션 그룹화 실패: {e}")
             raise
 
-    async def _group_trades_by_net_position(self, symbol: str, trades: List[Dict[str, Any]], target_date: datetime = None) -> List[Dict[str, Any]]:
-        """Net Position 로직으로 거래들을 포지션 그룹으로 변환 (9시 기준 날짜 범위 지원)"""
-        try:
-            # 시간순 정렬
-            sorted_trades = sorted(trades, key=lambda x: x['time'])
-            
-            position_groups = []
-            current_group_trades = []
-            current_net_position = 0.0
-            
-            for trade in sorted_trades:
-                side = trade['side']
-                qty = float(trade['qty'])
-                
-                # 포지션에 거래 추가
-                current_group_trades.append(trade)
-                
-                # Net Position 계산
-                if side == 'BUY':
-                    current_net_position += qty
-                else:  # SELL
-                    current_net_position -= qty
-                
-                # 포지션이 완료되었는지 확인 (0에 가까우면 완료)
-                if abs(current_net_position) < 0.0001:  # 소수점 오차 허용
-                    # 포지션 그룹 생성
-                    position_group = await self._create_position_group(symbol, current_group_trades, 'Closed')
-                    if position_group:
-                        # 9시 기준 날짜 범위 체크 (target_date가 지정된 경우)
-                        if target_date:
-                            start_time = target_date.replace(hour=9, minute=0, second=0, microsecond=0)
-                            end_time = start_time + timedelta(days=1)
-                            position_start = datetime.fromtimestamp(current_group_trades[0]['time'] / 1000)
-                            position_end = datetime.fromtimestamp(current_group_trades[-1]['time'] / 1000)
-                            
-                            # 해당 날짜 범위에 완료된 포지션만 포함
-                            if start_time <= position_end < end_time:
-                                position_groups.append(position_group)
-                        else:
-                            position_groups.append(position_group)
-                    
-                    # 초기화
-                    current_group_trades = []
-                    current_net_position = 0.0
-            
-            # 미완료 포지션 처리 (9시 기준 날짜 범위 체크)
-            if current_group_trades and abs(current_net_position) > 0.0001:
-                position_group = await self._create_position_group(symbol, current_group_trades, 'Open')
-                if position_group:
-                    # 9시 기준 날짜 범위 체크 (target_date가 지정된 경우)
-                    if target_date:
-                        start_time = target_date.replace(hour=9, minute=0, second=0, microsecond=0)
-                        end_time = start_time + timedelta(days=1)
-                        position_start = datetime.fromtimestamp(current_group_trades[0]['time'] / 1000)
-                        
-                        # 해당 날짜 범위에 시작된 미완료 포지션만 포함
-                        if start_time <= position_start < end_time:
-                            position_groups.append(position_group)
-                            logging.info(f"🔴 {symbol}: 미완료 포지션 발견 (Net: {current_net_position:.4f})")
-                    else:
-                        position_groups.append(position_group)
-                        logging.info(f"🔴 {symbol}: 미완료 포지션 발견 (Net: {current_net_position:.4f})")
-            
-            return position_groups
-            
-        except Exception as e:
-            logging.error(f"❌ {symbol} 포지션 그룹화 실패: {e}")
+    def _group_trades_by_net_position(self, symbol: str, trades: np.ndarray, target_date: datetime = None) -> List[Dict[str, Any]]:
+        """Net Position 로직으로 시간순 정렬된 거래 배열(TRADE_DTYPE)을 포지션 그룹으로 변환 (9시 기준 날짜 범위 지원)"""
+        if len(trades) == 0:
             return []
+        if target_date is None:
+            return self._group_trades_all(symbol, trades)
+        
+        # 9시 기준 날짜 범위 (밀리초로 한 번만 계산해 거래 시간과 바로 비교)
+        start_time = target_date.replace(hour=9, minute=0, second=0, microsecond=0)
+        start_ms = int(start_time.timestamp() * 1000)
+        end_ms = int((start_time + timedelta(days=1)).timestamp() * 1000)
+        return self._group_trades_windowed(symbol, trades, start_ms, end_ms)
 
-    async def _create_position_group(self, symbol: str, trades: List[Dict[str, Any]], status: str) -> Dict[str, Any]:
-        """거래 그룹에서 포지션 그룹 데이터 생성"""
-        try:
-            if not trades:
-                return None
-            
-            # 기본 정보
-            first_trade = trades[0]
-            last_trade = trades[-1]
-            
-            # 시간 계산 (실제 거래 시간 기준)
-            start_time = datetime.fromtimestamp(first_trade['time'] / 1000)
-            end_time = datetime.fromtimestamp(last_trade['time'] / 1000) if status == 'Closed' else None
-            
-            # 진입/청산 가격 계산
-            buy_trades = [t for t in trades if t['side'] == 'BUY']
-            sell_trades = [t for t in trades if t['side'] == 'SELL']
-            
-            # 가중평균 가격 계산
-            entry_price = 0.0
-            exit_price = 0.0
-            total_qty = 0.0
-            
-            # 모든 거래의 가중평균으로 진입가 계산
-            for trade in trades:
-                price = float(trade['price'])
-                qty = float(trade['qty'])
-                entry_price += price * qty
-                total_qty += qty
+    def _group_trades_all(self, symbol: str, trades: np.ndarray) -> List[Dict[str, Any]]:
+        """전체 거래를 포지션 그룹으로 변환 (날짜 범위 필터 없음)"""
+        group_ends, open_start, current_net_position = _scan_net_position(trades)
+        has_open = open_start < len(trades) and abs(current_net_position) > NET_POSITION_EPSILON
+        return self._build_position_groups(symbol, trades, group_ends, open_start, current_net_position, None, has_open)
+
+    def _group_trades_windowed(self, symbol: str, trades: np.ndarray, start_ms: int, end_ms: int) -> List[Dict[str, Any]]:
+        """날짜 범위 안의 포지션만 그룹으로 변환 (완료 포지션은 종료 거래, 미완료 포지션은 시작 거래 기준)"""
+        group_ends, open_start, current_net_position = _scan_net_position(trades)
+        
+        # 거래가 시간순이므로 범위 경계를 이진 탐색으로 한 번만 찾고 인덱스로 비교
+        range_first, range_end = np.searchsorted(trades['time'], [start_ms, end_ms], side='left').tolist()
+        closed_in_range = (range_first <= group_ends) & (group_ends < range_end)
+        has_open = (open_start < len(trades) and abs(current_net_position) > NET_POSITION_EPSILON
+                    and range_first <= open_start < range_end)
+        return self._build_position_groups(symbol, trades, group_ends, open_start, current_net_position, closed_in_range, has_open)
+
+    def _build_position_groups(self, symbol: str, trades: np.ndarray, group_ends: np.ndarray, open_start: int,
+                               current_net_position: float, closed_in_range: Optional[np.ndarray], has_open: bool) -> List[Dict[str, Any]]:
+        """완료 구간(closed_in_range가 None이면 전부)과 미완료 구간(has_open)을 포지션 그룹으로 변환"""
+        qtys = trades['qty']
+        is_buy = trades['side'].astype(bool)
+        is_sell = ~is_buy
+        amounts = trades['price'] * qtys
+        
+        # 구간별 합계를 한 번에 계산 (완료 구간 + 남은 구간이 배열 전체를 연속으로 덮음)
+        group_starts = np.concatenate(([0], group_ends[:-1] + 1)).astype(np.int64)[:len(group_ends)]
+        segment_starts = group_starts if open_start >= len(trades) else np.append(group_starts, open_start)
+        segment_lasts = np.append(segment_starts[1:], len(trades)) - 1
+        segments = zip(
+            segment_starts.tolist(), segment_lasts.tolist(),
+            np.add.reduceat(amounts, segment_starts).tolist(),
+            np.add.reduceat(qtys, segment_starts).tolist(),
+            np.add.reduceat(np.where(is_buy, qtys, 0.0), segment_starts).tolist(),
+            np.add.reduceat(np.where(is_buy, amounts, 0.0), segment_starts).tolist(),
+            np.add.reduceat(np.where(is_sell, qtys, 0.0), segment_starts).tolist(),
+            np.add.reduceat(np.where(is_sell, amounts, 0.0), segment_starts).tolist(),
+            np.add.reduceat(is_sell.astype(np.int64), segment_starts).tolist()
+        )
+        include = ([True] * len(group_ends) if closed_in_range is None else closed_in_range.tolist()) + [has_open]
+        times_list = trades['time'].tolist()
+        is_buy_list = is_buy.tolist()
+        
+        position_groups = []
+        for index, (first, last, total_amount, total_qty, buy_qty, buy_amount, sell_qty, sell_amount, sell_count) in enumerate(segments):
+            if not include[index]:
+                continue
             
-            if total_qty > 0:
-                entry_price = entry_price / total_qty
+            # 포지션 그룹 생성
+            status = 'Closed' if index < len(group_ends) else 'Open'
+            position_groups.append(self._create_position_group(
+                symbol, status,
+                start_ms=times_list[first], end_ms=times_list[last], first_is_buy=is_buy_list[first],
+                trade_count=last - first + 1, total_amount=total_amount, total_qty=total_qty,
+                buy_qty=buy_qty, buy_amount=buy_amount,
+                sell_qty=sell_qty, sell_amount=sell_amount, sell_count=sell_count
+            ))
+            if status == 'Open':
+                logging.info("🔴 %s: 미완료 포지션 발견 (Net: %.4f)", symbol, current_net_position)
+        
+        return position_groups
+
+    def _create_position_group(self, symbol: str, status: str, start_ms: int, end_ms: int, first_is_buy: bool,
+                               trade_count: int, total_amount: float, total_qty: float,
+                               buy_qty: float, buy_amount: float,
+                               sell_qty: float, sell_amount: float, sell_count: int) -> Dict[str, Any]:
+        """거래 구간의 합계에서 포지션 그룹 데이터 생성"""
+        # 시간 계산 (실제 거래 시간 기준, DB와 리포트가 로컬 시간으로 읽으므로 로컬 naive 시간 유지)
+        start_time_iso = datetime.fromtimestamp(start_ms / 1000).isoformat()
+        
+        # 완료 포지션만 종료 시간, 손익, 청산가, 지속시간 계산 (미완료 포지션은 손익 0)
+        end_time_iso = None
+        duration_minutes = 0
+        pnl_amount = 0.0
+        pnl_percentage = 0.0
+        exit_price = 0.0
+        if status == 'Closed':
+            end_time_iso = datetime.fromtimestamp(end_ms / 1000).isoformat()
+            # 지속시간은 밀리초 정수 연산으로 계산 (거래가 시간순이므로 음수 없음)
+            duration_minutes = (end_ms - start_ms) // 60000
             
+            # P&L 계산 (실제 실현손익: 매도 금액 - 매수 금액)
+            pnl_amount = sell_amount - buy_amount
+            if buy_amount > 0:
+                pnl_percentage = (pnl_amount / buy_amount) * 100
+            if sell_count:
+                exit_price = sell_amount / sell_qty
+        
+        return {
+            'symbol': symbol,
             # 포지션 방향 결정 (첫 번째 거래 기준)
-            side = 'Long' if first_trade['side'] == 'BUY' else 'Short'
-            
+            'side': 'Long' if first_is_buy else 'Short',
+            # 모든 거래의 가중평균으로 진입가 계산
+            'entry_price': total_amount / total_qty if total_qty > 0 else total_amount,
+            'exit_price': exit_price,
             # 수량 계산 (절댓값)
-            net_qty = sum(float(t['qty']) for t in buy_trades) - sum(float(t['qty']) for t in sell_trades)
-            quantity = abs(net_qty)
-            
-            # P&L 계산 (실제 실현손익)
-            if status == 'Closed':
-                # 매수 금액 - 매도 금액
-                buy_amount = sum(float(t['price']) * float(t['qty']) for t in buy_trades)
-                sell_amount = sum(float(t['price']) * float(t['qty']) for t in sell_trades)
-                pnl_amount = sell_amount - buy_amount
-                
-                if buy_amount > 0:
-                    pnl_percentage = (pnl_amount / buy_amount) * 100
-                else:
-                    pnl_percentage = 0.0
-                    
-                exit_price = sell_amount / sum(float(t['qty']) for t in sell_trades) if sell_trades else 0.0
-            else:
-                # 미완료 포지션은 손익 0
-                pnl_amount = 0.0
-                pnl_percentage = 0.0
-                exit_price = 0.0
-            
-            # 지속시간 계산
-            duration_minutes = 0
-            if end_time:
-                duration_minutes = int((end_time - start_time).total_seconds() / 60)
-            
-            position_group = {
-                'symbol': symbol,
-                'side': side,
-                'entry_price': entry_price,
-                'exit_price': exit_price,
-                'quantity': quantity,
-                'pnl_amount': pnl_amount,
-                'pnl_percentage': pnl_percentage,
-                'start_time': start_time.isoformat(),
-                'end_time': end_time.isoformat() if end_time else None,
-                'duration_minutes': duration_minutes,
-                'trade_count': len(trades),
-                'position_type': status,
-                'position_status': status
-            }
-            
-            return position_group
-            
-        except Exception as e:
-            logging.error(f"❌ 포지션 그룹 생성 실패: {e}")
-            return None
+            'quantity': abs(buy_qty - sell_qty),
+            'pnl_amount': pnl_amount,
+            'pnl_percentage': pnl_percentage,
+            'start_time': start_time_iso,
+            'end_time': end_time_iso,
+            'duration_minutes': duration_minutes,
+            'trade_count': trade_count,
+            'position_type': status,
+            'position_status': status
+        }
+
 
 async def main():
     """메인 실행 함수"""
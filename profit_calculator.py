@@ -1,7 +1,13 @@
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
-from utils import logger, safe_float_conversion, format_korean_won, format_percentage
+from utils import logger, safe_float_conversion, format_korean_won, format_korean_won_array, format_percentage
+
+# 이 개수를 넘는 포지션 목록은 수익금 포맷팅을 NumPy로 일괄 처리
+VECTORIZED_FORMAT_THRESHOLD = 8
+
+# 시장 유형(상승장/하락장/횡보장) 판단에 쓰는 기준 심볼
+MARKET_REFERENCE_SYMBOLS = ('BTCUSDT', 'ETHUSDT')
 
 class ProfitCalculator:
     """포지션별 및 전체 수익률 계산 클래스"""
@@ -384,10 +390,16 @@ class ProfitCalculator:
             if not positions:
                 return "오늘은 거래가 없었습니다."
             
-            table_rows = []
-            for pos in positions:
-                row = f"| {pos['symbol']} | {pos['side']} | {pos['entry_price']:,.2f} | {pos['exit_price']:,.2f} | {pos['pnl_percentage']:+.2f}% | {format_korean_won(pos['pnl_amount'])} |"
-                table_rows.append(row)
+            # 포지션이 많으면 수익금 포맷팅을 NumPy로 한 번에 처리
+            if len(positions) > VECTORIZED_FORMAT_THRESHOLD:
+                pnl_amounts = format_korean_won_array([pos['pnl_amount'] for pos in positions])
+            else:
+                pnl_amounts = [format_korean_won(pos['pnl_amount']) for pos in positions]
+            
+            table_rows = [
+                f"| {pos['symbol']} | {pos['side']} | {pos['entry_price']:,.2f} | {pos['exit_price']:,.2f} | {pos['pnl_percentage']:+.2f}% | {pnl_amount} |"
+                for pos, pnl_amount in zip(positions, pnl_amounts)
+            ]
             
             table = "| 종목 | 방향 | 진입가 | 청산가 | 수익률 | 수익금 |\n"
             table += "|------|------|--------|--------|--------|---------|\n"
@@ -406,10 +418,9 @@ class ProfitCalculator:
                 return "횡보장"
             
             # 주요 심볼들의 가격 변화 분석
-            main_symbols = ['BTCUSDT', 'ETHUSDT']
             price_changes = []
             
-            for symbol in main_symbols:
+            for symbol in MARKET_REFERENCE_SYMBOLS:
                 if symbol in price_data and not price_data[symbol].empty:
                     df = price_data[symbol]
                     if len(df) >= 2:
@@ -432,70 +443,113 @@ class ProfitCalculator:
             logger.error(f"시장 유형 판단 중 오류: {e}")
             return "횡보장"
     
-    def get_difficulty_level(self, positions: List[Dict[str, Any]], win_rate: float) -> str:
-        """매매 난이도 판단 - 거래 복잡도 기반"""
+    def analyze_market(self, positions: List[Dict[str, Any]], price_data: Optional[Dict[str, pd.DataFrame]] = None,
+                       win_rate: Optional[float] = None) -> Tuple[str, str]:
+        """
+        시장 유형과 매매 난이도를 함께 판단 (포지션 목록은 한 번만 순회)
+        
+        Args:
+            positions: 포지션 리스트
+            price_data: 심볼별 K라인 데이터 (없으면 횡보장)
+            win_rate: 승률(%) - 지정하지 않으면 포지션 손익으로 계산
+            
+        Returns:
+            (시장 유형, 난이도)
+        """
+        market_type = self.get_market_type(positions, price_data)
         try:
             if not positions:
-                return "난이도 하"
-            
-            # 거래 복잡도 점수 계산
-            complexity_score = 0
-            total_positions = len(positions)
-            
-            # 1. 포지션당 평균 거래 횟수 계산
-            total_trades_in_positions = 0
-            high_frequency_positions = 0
-            
-            for position in positions:
-                trade_count = position.get('trade_count', 1)
-                total_trades_in_positions += trade_count
-                
-                # 한 포지션에서 거래가 많이 일어난 경우 복잡도 증가
-                if trade_count >= 10:
-                    complexity_score += 3  # 10회 이상 거래한 포지션
-                    high_frequency_positions += 1
-                elif trade_count >= 5:
-                    complexity_score += 2  # 5-9회 거래한 포지션
-                    high_frequency_positions += 1
-                elif trade_count >= 3:
-                    complexity_score += 1  # 3-4회 거래한 포지션
-            
-            # 2. 평균 거래 횟수
-            avg_trades_per_position = total_trades_in_positions / total_positions if total_positions > 0 else 1
-            if avg_trades_per_position >= 8:
-                complexity_score += 3
-            elif avg_trades_per_position >= 5:
-                complexity_score += 2
-            elif avg_trades_per_position >= 3:
-                complexity_score += 1
-            
-            # 3. 고빈도 거래 포지션 비율
-            if total_positions > 0:
-                high_freq_ratio = high_frequency_positions / total_positions
-                if high_freq_ratio >= 0.5:  # 50% 이상이 고빈도 거래
-                    complexity_score += 2
-                elif high_freq_ratio >= 0.3:  # 30% 이상이 고빈도 거래
-                    complexity_score += 1
+                return market_type, "난이도 하"
             
-            # 4. 전체 포지션 수도 고려
-            if total_positions >= 15:
-                complexity_score += 2
-            elif total_positions >= 10:
-                complexity_score += 1
+            stats = self._scan_position_complexity(positions)
+            if win_rate is None:
+                win_rate = stats['win_count'] / len(positions) * 100
+            return market_type, self._difficulty_from_stats(len(positions), stats, win_rate)
             
-            # 5. 승률이 낮으면 난이도 증가 (어려웠다는 의미)
-            if win_rate < 40:
+        except Exception as e:
+            logger.error(f"난이도 판단 중 오류: {e}")
+            return market_type, "난이도 중"
+    
+    def _scan_position_complexity(self, positions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """포지션별 거래 횟수 기반 복잡도 점수와 수익 포지션 수를 한 번에 집계"""
+        complexity_score = 0
+        total_trades_in_positions = 0
+        high_frequency_positions = 0
+        win_count = 0
+        
+        for position in positions:
+            trade_count = position.get('trade_count', 1)
+            total_trades_in_positions += trade_count
+            
+            # 한 포지션에서 거래가 많이 일어난 경우 복잡도 증가
+            if trade_count >= 10:
+                complexity_score += 3  # 10회 이상 거래한 포지션
+                high_frequency_positions += 1
+            elif trade_count >= 5:
+                complexity_score += 2  # 5-9회 거래한 포지션
+                high_frequency_positions += 1
+            elif trade_count >= 3:
+                complexity_score += 1  # 3-4회 거래한 포지션
+            
+            if float(position.get('pnl_amount', 0)) > 0:
+                win_count += 1
+        
+        return {
+            'complexity_score': complexity_score,
+            'total_trades_in_positions': total_trades_in_positions,
+            'high_frequency_positions': high_frequency_positions,
+            'win_count': win_count
+        }
+    
+    def _difficulty_from_stats(self, total_positions: int, stats: Dict[str, Any], win_rate: float) -> str:
+        """집계된 포지션 통계와 승률로 최종 난이도 결정"""
+        # 1. 포지션당 거래 횟수 기반 점수
+        complexity_score = stats['complexity_score']
+        
+        # 2. 평균 거래 횟수
+        avg_trades_per_position = stats['total_trades_in_positions'] / total_positions if total_positions > 0 else 1
+        if avg_trades_per_position >= 8:
+            complexity_score += 3
+        elif avg_trades_per_position >= 5:
+            complexity_score += 2
+        elif avg_trades_per_position >= 3:
+            complexity_score += 1
+        
+        # 3. 고빈도 거래 포지션 비율
+        if total_positions > 0:
+            high_freq_ratio = stats['high_frequency_positions'] / total_positions
+            if high_freq_ratio >= 0.5:  # 50% 이상이 고빈도 거래
                 complexity_score += 2
-            elif win_rate < 60:
+            elif high_freq_ratio >= 0.3:  # 30% 이상이 고빈도 거래
                 complexity_score += 1
+        
+        # 4. 전체 포지션 수도 고려
+        if total_positions >= 15:
+            complexity_score += 2
+        elif total_positions >= 10:
+            complexity_score += 1
+        
+        # 5. 승률이 낮으면 난이도 증가 (어려웠다는 의미)
+        if win_rate < 40:
+            complexity_score += 2
+        elif win_rate < 60:
+            complexity_score += 1
+        
+        # 최종 난이도 결정
+        if complexity_score >= 8:
+            return "난이도 상"  # 매우 복잡한 거래 패턴
+        elif complexity_score >= 4:
+            return "난이도 중"  # 어느 정도 복잡한 거래
+        else:
+            return "난이도 하"  # 단순한 거래 패턴
+    
+    def get_difficulty_level(self, positions: List[Dict[str, Any]], win_rate: float) -> str:
+        """매매 난이도 판단 - 거래 복잡도 기반"""
+        try:
+            if not positions:
+                return "난이도 하"
             
-            # 최종 난이도 결정
-            if complexity_score >= 8:
-                return "난이도 상"  # 매우 복잡한 거래 패턴
-            elif complexity_score >= 4:
-                return "난이도 중"  # 어느 정도 복잡한 거래
-            else:
-                return "난이도 하"  # 단순한 거래 패턴
+            return self._difficulty_from_stats(len(positions), self._scan_position_complexity(positions), win_rate)
                 
         except Exception as e:
             logger.error(f"난이도 판단 중 오류: {e}")
@@ -14,6 +14,7 @@ from utils import logger
 
 async def main():
     """메인 실행 함수"""
+    journal_system = None
     try:
         logger.info("🚀 Railway 매매일지 생성 시작...")
         
@@ -40,6 +41,9 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Railway 실행 중 오류: {e}")
         return 1
+    finally:
+        if journal_system:
+            await journal_system.close()
 
 if __name__ == "__main__":
     exit_code = asyncio.run(main())
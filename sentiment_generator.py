@@ -248,13 +248,15 @@ class SentimentGenerator:
             pnl_percentage = daily_summary.get('daily_pnl_percentage', 0)
             positions = positions or []
             
-            # 손실 포지션 개수와 손실 규모 계산
-            loss_positions = [pos for pos in positions if float(pos.get('pnl_amount', 0)) < 0]
-            loss_count = len(loss_positions)
-            total_positions = len(positions)
+            # 손실 포지션 개수와 큰 손실(-5% 미만) 여부를 한 번에 집계
+            loss_count = 0
+            has_big_loss = False
+            for pos in positions:
+                if float(pos.get('pnl_amount', 0)) < 0:
+                    loss_count += 1
+                    if float(pos.get('pnl_percentage', 0)) < -5:
+                        has_big_loss = True
             
-            # 총 손실 비율
-            total_loss_amount = sum(float(pos.get('pnl_amount', 0)) for pos in loss_positions)
             loss_percentage = abs(pnl_percentage) if pnl_percentage < 0 else 0
             
             # 중요도 계산 (손실이 클수록, 손실 포지션이 많을수록 높은 별점)
@@ -269,16 +271,15 @@ class SentimentGenerator:
                 importance_score += 1  # 약간의 손실 시 +1점
             
             # 2. 손실 포지션 비율에 따른 점수
-            if total_positions > 0:
-                loss_ratio = loss_count / total_positions
+            if positions:
+                loss_ratio = loss_count / len(positions)
                 if loss_ratio > 0.7:  # 70% 이상이 손실
                     importance_score += 2
                 elif loss_ratio > 0.5:  # 50-70%가 손실
                     importance_score += 1
             
             # 3. 큰 손실 포지션 존재 여부
-            big_loss_positions = [pos for pos in loss_positions if float(pos.get('pnl_percentage', 0)) < -5]
-            if big_loss_positions:
+            if has_big_loss:
                 importance_score += 1
             
             # 4. 수익이 나도 손실 포지션이 많으면 경고
@@ -8,10 +8,22 @@ Supabase 기반 거래 데이터 관리 모듈
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from supabase import create_client, Client
 from config import Config
 
+# 동시에 진행할 Supabase 쓰기 요청 수 (공유 HTTP 커넥션 풀 크기 내에서 유지)
+SUPABASE_MAX_CONCURRENT_WRITES = 10
+
+# 한 번의 upsert 요청에 담을 최대 거래 행 수 (PostgREST 요청 크기 제한 대비)
+TRADES_UPSERT_CHUNK_SIZE = 1000
+
+# 한 번의 upsert 요청에 담을 최대 포지션 그룹 행 수
+POSITION_GROUPS_UPSERT_CHUNK_SIZE = 500
+
+# 거래 데이터를 나눠 조회할 때 한 페이지의 행 수 (PostgREST 기본 최대 응답 행 수)
+TRADES_PAGE_SIZE = 1000
+
 class SupabaseManager:
     """Supabase 기반 거래 데이터 관리"""
     
@@ -22,11 +34,19 @@ class SupabaseManager:
                 Config.SUPABASE_URL, 
                 Config.SUPABASE_KEY
             )
+            # 쓰기 요청은 하나의 클라이언트(keep-alive 커넥션)를 공유하면서
+            # 세마포어로 동시 실행 수만 제한
+            self._write_sem = asyncio.Semaphore(SUPABASE_MAX_CONCURRENT_WRITES)
             logging.info("Supabase 연결 완료")
         except Exception as e:
             logging.error(f"Supabase 연결 실패: {e}")
             raise
 
+    async def _execute_write(self, query):
+        """쓰기 쿼리를 스레드에서 실행하여 이벤트 루프를 막지 않도록 함"""
+        async with self._write_sem:
+            return await asyncio.to_thread(query.execute)
+
     async def initialize_tables(self):
         """필요한 테이블들을 생성 (SQL 스크립트 실행 필요)"""
         tables_sql = """
@@ -83,7 +103,29 @@ class SupabaseManager:
         CREATE INDEX IF NOT EXISTS idx_trades_time ON trades(time);
         CREATE INDEX IF NOT EXISTS idx_position_groups_close_date ON position_groups(close_date);
         CREATE INDEX IF NOT EXISTS idx_position_groups_status ON position_groups(position_status);
+        CREATE INDEX IF NOT EXISTS idx_position_groups_start_time ON position_groups(start_time);
         CREATE INDEX IF NOT EXISTS idx_daily_pnl_date ON daily_pnl(trade_date);
+
+        -- 중복 데이터 확인용 함수 (check_duplicates.py에서 RPC로 호출)
+        CREATE OR REPLACE FUNCTION duplicate_trade_ids()
+        RETURNS TABLE (trade_id TEXT, cnt BIGINT) AS $$
+            SELECT t.trade_id, COUNT(*) FROM trades t
+            GROUP BY t.trade_id HAVING COUNT(*) > 1;
+        $$ LANGUAGE sql STABLE;
+
+        CREATE OR REPLACE FUNCTION duplicate_position_keys()
+        RETURNS TABLE (symbol TEXT, start_time TIMESTAMP, side TEXT, cnt BIGINT) AS $$
+            SELECT p.symbol, p.start_time, p.side, COUNT(*) FROM position_groups p
+            GROUP BY p.symbol, p.start_time, p.side HAVING COUNT(*) > 1;
+        $$ LANGUAGE sql STABLE;
+
+        -- 종목별 최신 거래 시간 (main.py 동기화에서 RPC로 호출)
+        CREATE OR REPLACE FUNCTION latest_trade_times(symbols TEXT[])
+        RETURNS TABLE (symbol TEXT, latest_time BIGINT) AS $$
+            SELECT t.symbol, MAX(t.time) FROM trades t
+            WHERE t.symbol = ANY(symbols)
+            GROUP BY t.symbol;
+        $$ LANGUAGE sql STABLE;
         """
         
         logging.info("⚠️  테이블 초기화 SQL이 준비되었습니다.")
@@ -102,11 +144,13 @@ class SupabaseManager:
             return
             
         try:
-            # 거래 데이터 변환
-            trade_records = []
+            # 거래 데이터 변환 (같은 배치 안의 중복 trade_id 제거)
+            trade_date_str = trade_date.date().isoformat()
+            records_by_id = {}
             for trade in trades:
-                trade_record = {
-                    'trade_id': str(trade['id']),
+                trade_id = str(trade['id'])
+                records_by_id[trade_id] = {
+                    'trade_id': trade_id,
                     'symbol': trade['symbol'],
                     'side': trade['side'],
                     'price': float(trade['price']),
@@ -114,15 +158,19 @@ class SupabaseManager:
                     'commission': float(trade['commission']),
                     'commission_asset': trade['commissionAsset'],
                     'time': int(trade['time']),
-                    'trade_date': trade_date.date().isoformat()
+                    'trade_date': trade_date_str
                 }
-                trade_records.append(trade_record)
-            
-            # 배치 삽입 (중복 무시)
-            result = self.supabase.table('trades').upsert(
-                trade_records, 
-                on_conflict='trade_id'
-            ).execute()
+            trade_records = list(records_by_id.values())
+            
+            # 청크 단위 배치 upsert (이미 저장된 trade_id는 다시 동기화한 값으로 갱신)
+            results = await asyncio.gather(*(
+                self._execute_write(self.supabase.table('trades').upsert(
+                    trade_records[i:i + TRADES_UPSERT_CHUNK_SIZE],
+                    on_conflict='trade_id'
+                ))
+                for i in range(0, len(trade_records), TRADES_UPSERT_CHUNK_SIZE)
+            ))
+            result = results[-1]
             
             logging.info(f"✅ {len(trade_records)}개 거래 데이터 저장 완료")
             return result
@@ -163,12 +211,16 @@ class SupabaseManager:
             # 포지션 그룹 저장 (누적 방식)
             if position_records:
                 try:
-                    # 배치 upsert 방식으로 중복 방지 및 누적 저장
+                    # 청크 단위 배치 upsert를 동시에 보내 중복 방지 및 누적 저장
                     # symbol + start_time + side 조합으로 중복 체크
-                    result = self.supabase.table('position_groups').upsert(
-                        position_records,
-                        on_conflict='symbol,start_time,side'
-                    ).execute()
+                    results = await asyncio.gather(*(
+                        self._execute_write(self.supabase.table('position_groups').upsert(
+                            position_records[i:i + POSITION_GROUPS_UPSERT_CHUNK_SIZE],
+                            on_conflict='symbol,start_time,side'
+                        ))
+                        for i in range(0, len(position_records), POSITION_GROUPS_UPSERT_CHUNK_SIZE)
+                    ))
+                    result = results[-1]
                     
                     logging.info(f"✅ {len(position_records)}개 포지션 그룹 upsert 완료")
                     
@@ -261,10 +313,10 @@ class SupabaseManager:
             }
             
             # Upsert (날짜 기준으로 중복 방지)
-            result = self.supabase.table('daily_pnl').upsert(
+            result = await self._execute_write(self.supabase.table('daily_pnl').upsert(
                 pnl_record,
                 on_conflict='trade_date'
-            ).execute()
+            ))
             
             logging.info(f"✅ {trade_date.date()} 일별 P&L 저장 완료")
             return result
@@ -292,6 +344,83 @@ class SupabaseManager:
             logging.error(f"거래 데이터 조회 실패: {e}")
             return []
 
+    async def iter_trades(self, start_date: datetime = None, end_date: datetime = None,
+                          page_size: int = TRADES_PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """거래 데이터를 시간순 페이지 단위로 조회 (현재 페이지를 처리하는 동안 다음 페이지를 미리 요청)"""
+        def page_query(offset: int):
+            query = self.supabase.table('trades').select('*')
+            if start_date:
+                query = query.gte('trade_date', start_date.date().isoformat())
+            if end_date:
+                query = query.lte('trade_date', end_date.date().isoformat())
+            # 같은 시간의 거래도 페이지 사이에서 순서가 바뀌지 않도록 trade_id로 정렬 고정
+            return query.order('time').order('trade_id').range(offset, offset + page_size - 1)
+        
+        offset = 0
+        next_page = asyncio.ensure_future(asyncio.to_thread(page_query(offset).execute))
+        try:
+            while True:
+                rows = (await next_page).data
+                if len(rows) == page_size:
+                    offset += page_size
+                    next_page = asyncio.ensure_future(asyncio.to_thread(page_query(offset).execute))
+                if rows:
+                    yield rows
+                if len(rows) < page_size:
+                    return
+        except Exception as e:
+            logging.error(f"거래 데이터 페이지 조회 실패 (offset {offset}): {e}")
+            raise
+        finally:
+            # 호출 측에서 순회를 중단한 경우 미리 보낸 요청 정리
+            if not next_page.done():
+                next_page.cancel()
+
+    async def get_latest_trade_times(self, symbols: List[str]) -> Dict[str, int]:
+        """종목별 최신 거래 시간(ms) 조회 (RPC 한 번, 없으면 종목별 조회로 폴백)"""
+        if not symbols:
+            return {}
+        try:
+            query = self.supabase.rpc('latest_trade_times', {'symbols': list(symbols)})
+            result = await asyncio.to_thread(query.execute)
+            return {row['symbol']: int(row['latest_time']) for row in result.data if row['latest_time'] is not None}
+        except Exception as e:
+            # 기존 DB에 latest_trade_times 함수가 없으면 initialize_tables의 SQL을 다시 실행해야 함
+            logging.warning(f"latest_trade_times RPC 호출 실패, 종목별 조회로 대체 (initialize_tables SQL 재실행 필요): {e}")
+        
+        async def fetch_latest(symbol: str) -> Optional[int]:
+            try:
+                query = self.supabase.table('trades').select('time').eq(
+                    'symbol', symbol
+                ).order('time', desc=True).limit(1)
+                result = await asyncio.to_thread(query.execute)
+                if result.data:
+                    return int(result.data[0]['time'])
+            except Exception as e:
+                logging.error(f"❌ {symbol} 최신 거래 조회 실패: {e}")
+            return None
+        
+        results = await asyncio.gather(*(fetch_latest(symbol) for symbol in symbols))
+        return {symbol: latest for symbol, latest in zip(symbols, results) if latest is not None}
+
+    async def get_duplicate_trade_ids(self) -> Optional[List[str]]:
+        """DB에서 중복된 trade_id 집계 (RPC 함수가 없으면 None)"""
+        try:
+            result = self.supabase.rpc('duplicate_trade_ids').execute()
+            return [row['trade_id'] for row in result.data]
+        except Exception as e:
+            logging.warning(f"duplicate_trade_ids RPC 호출 실패: {e}")
+            return None
+
+    async def get_duplicate_position_keys(self) -> Optional[List[tuple]]:
+        """DB에서 중복된 (symbol, start_time, side) 집계 (RPC 함수가 없으면 None)"""
+        try:
+            result = self.supabase.rpc('duplicate_position_keys').execute()
+            return [(row['symbol'], row['start_time'], row['side']) for row in result.data]
+        except Exception as e:
+            logging.warning(f"duplicate_position_keys RPC 호출 실패: {e}")
+            return None
+
     async def get_closed_positions_for_date(self, target_date: datetime) -> List[Dict[str, Any]]:
         """특정 날짜에 완료된 포지션들만 조회 (9시 기준)"""
         try:
@@ -442,7 +571,8 @@ class SupabaseManager:
         """Supabase 연결 테스트"""
         try:
             # 간단한 쿼리로 연결 확인
-            result = self.supabase.table('trades').select('count').limit(1).execute()
+            query = self.supabase.table('trades').select('count').limit(1)
+            result = await asyncio.to_thread(query.execute)
             logging.info("✅ Supabase 연결 테스트 성공")
             return True
         except Exception as e:
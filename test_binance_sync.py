@@ -14,6 +14,7 @@ from utils import logger
 
 async def test_binance_sync(target_date: datetime):
     """Binance → Supabase 동기화 테스트"""
+    journal_system = None
     try:
         logger.info("🧪 Binance → Supabase 동기화 테스트 시작...")
         
@@ -61,6 +62,9 @@ async def test_binance_sync(target_date: datetime):
     except Exception as e:
         logger.error(f"❌ 테스트 실패: {e}")
         return False
+    finally:
+        if journal_system:
+            await journal_system.close()
 
 async def main():
     """메인 실행 함수"""
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+포지션 완료 지점 탐색(_find_close_indices) 테스트
+
+완료 지점마다 Net Position을 0으로 초기화하는 기존 반복문과 결과가 같은지 확인합니다.
+"""
+
+import random
+import time
+import unittest
+
+import numpy as np
+
+from position_grouper import NET_POSITION_EPSILON, _find_close_indices
+
+
+def _reference_close_indices(signed_qtys, eps=NET_POSITION_EPSILON):
+    """기존 반복문 방식 (완료 지점에서 Net Position 초기화)"""
+    closes = []
+    net_position = 0.0
+    for i, qty in enumerate(signed_qtys):
+        net_position += qty
+        if abs(net_position) < eps:
+            closes.append(i)
+            net_position = 0.0
+    return closes
+
+
+class FindCloseIndicesTest(unittest.TestCase):
+    def assert_matches_reference(self, signed_qtys):
+        signed_qtys = np.asarray(signed_qtys, dtype=np.float64)
+        self.assertEqual(_find_close_indices(signed_qtys).tolist(), _reference_close_indices(signed_qtys.tolist()))
+
+    def test_empty(self):
+        self.assertEqual(_find_close_indices(np.empty(0)).tolist(), [])
+
+    def test_open_position_has_no_close(self):
+        self.assert_matches_reference([0.5, 0.25, -0.1])
+
+    def test_many_fractional_closes(self):
+        # 소수 수량으로 여러 번 진입/청산 (누적 합의 소수점 오차가 쌓이는 경우)
+        rng = random.Random(7)
+        signed_qtys = []
+        for _ in range(2000):
+            entries = [round(rng.uniform(0.001, 3.0), 3) for _ in range(rng.randint(1, 4))]
+            side = rng.choice((1, -1))
+            signed_qtys.extend(side * qty for qty in entries)
+            signed_qtys.append(-side * round(sum(entries), 3))
+        self.assert_matches_reference(signed_qtys)
+        self.assertEqual(len(_find_close_indices(np.asarray(signed_qtys))), 2000)
+
+    def test_sub_epsilon_residue_is_reset_at_each_close(self):
+        # 허용 오차보다 작은 잔량이 남은 채 완료되어도 다음 포지션에 누적되지 않아야 함
+        signed_qtys = [1.00006, -1.0] * 50
+        self.assert_matches_reference(signed_qtys)
+        self.assertEqual(_find_close_indices(np.asarray(signed_qtys)).tolist(), list(range(1, 100, 2)))
+
+    def test_residue_heavy_input_is_linear(self):
+        # 모든 완료 지점에 잔량이 남아도 한 번만 순회 (완료 지점 수에 비례해 다시 탐색하지 않음)
+        signed_qtys = np.asarray([1.00006, -1.0] * 50000)
+        started = time.perf_counter()
+        closes = _find_close_indices(signed_qtys)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(closes.tolist(), list(range(1, 100000, 2)))
+        self.assertLess(elapsed, 0.5)
+
+    def test_mixed_residue_and_exact_closes(self):
+        signed_qtys = [0.3, -0.29995, 0.1, 0.2, -0.3, 2.5, -2.50004, -0.7, 0.7]
+        self.assert_matches_reference(signed_qtys)
+
+
+if __name__ == "__main__":
+    unittest.main()
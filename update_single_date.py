@@ -18,6 +18,7 @@ from notion_uploader import NotionUploader
 
 async def update_position_table_for_single_date(target_date: str):
     """단일 날짜의 포지션 테이블만 업데이트"""
+    journal_system = None
     try:
         # 날짜 파싱
         target_dt = datetime.strptime(target_date, '%Y-%m-%d')
@@ -62,7 +63,7 @@ async def update_position_table_for_single_date(target_date: str):
                 positions.append(position)
         
         # 기존 페이지 내용 가져오기
-        children_response = notion_uploader.client.blocks.children.list(block_id=existing_page_id)
+        children_response = await notion_uploader.list_block_children(existing_page_id)
         existing_blocks = children_response['results']
         
         # 새로운 포지션 테이블 생성
@@ -106,19 +107,12 @@ async def update_position_table_for_single_date(target_date: str):
             # 포지션 섹션이 아닌 블록들은 그대로 유지
             updated_blocks.append(block)
         
-        # 기존 내용 삭제
-        for block in existing_blocks:
-            try:
-                notion_uploader.client.blocks.delete(block_id=block['id'])
-            except:
-                pass  # 일부 블록은 삭제 불가능할 수 있음
+        # 기존 내용 삭제 (동시에 삭제, 일부 블록은 삭제 불가능할 수 있음)
+        await notion_uploader.delete_blocks([block['id'] for block in existing_blocks])
         
         # 새 내용 추가
         if updated_blocks:
-            notion_uploader.client.blocks.children.append(
-                block_id=existing_page_id,
-                children=updated_blocks
-            )
+            await notion_uploader.append_block_children(existing_page_id, updated_blocks)
         
         logger.info(f"✅ {target_date} 포지션 테이블 업데이트 완료!")
         print(f"✅ {target_date} 포지션 테이블 업데이트 완료!")
@@ -128,6 +122,9 @@ async def update_position_table_for_single_date(target_date: str):
         logger.error(f"❌ {target_date} 포지션 테이블 업데이트 중 오류: {e}")
         print(f"❌ {target_date} 포지션 테이블 업데이트 중 오류: {e}")
         return False
+    finally:
+        if journal_system:
+            await journal_system.close()
 
 async def main():
     """메인 실행 함수"""
@@ -1,5 +1,7 @@
 import os
+import asyncio
 import logging
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import pandas as pd
@@ -17,6 +19,18 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     )
     return logging.getLogger(__name__)
 
+async def gather_or_cancel(*aws) -> list:
+    """작업들을 동시에 실행하고, 하나라도 실패하면 나머지를 즉시 취소한 뒤 예외를 전파 (TaskGroup과 같은 동작)"""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # 취소된 작업이 정리될 때까지 대기 (소켓/세마포어 반환)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 def ensure_directory_exists(directory: str) -> None:
     """디렉토리가 존재하지 않으면 생성"""
     if not os.path.exists(directory):
@@ -26,6 +40,22 @@ def timestamp_to_datetime(timestamp: int) -> datetime:
     """밀리초 타임스탬프를 datetime 객체로 변환"""
     return datetime.fromtimestamp(timestamp / 1000)
 
+def format_time_of_day_array(timestamps_ms) -> np.ndarray:
+    """밀리초 타임스탬프 배열을 로컬 시간 'HH:MM:SS' 문자열 배열로 일괄 변환 (fromtimestamp().strftime의 벡터화 버전)"""
+    timestamps_ms = np.asarray(timestamps_ms, dtype=np.int64)
+    if timestamps_ms.size == 0:
+        return np.array([], dtype=str)
+    
+    # datetime.fromtimestamp와 같은 로컬 시간이 되도록 UTC 오프셋 적용
+    first_offset = datetime.fromtimestamp(int(timestamps_ms.min()) // 1000).astimezone().utcoffset()
+    last_offset = datetime.fromtimestamp(int(timestamps_ms.max()) // 1000).astimezone().utcoffset()
+    if first_offset != last_offset:
+        # 구간 내 오프셋이 바뀌는 경우(서머타임 전환)는 개별 변환
+        return np.array([datetime.fromtimestamp(ts / 1000).strftime('%H:%M:%S') for ts in timestamps_ms.tolist()])
+    
+    local_times = (timestamps_ms + int(first_offset.total_seconds() * 1000)).astype('datetime64[ms]')
+    return np.char.partition(np.datetime_as_string(local_times, unit='s'), 'T')[..., 2]
+
 def datetime_to_timestamp(dt: datetime) -> int:
     """datetime 객체를 밀리초 타임스탬프로 변환"""
     return int(dt.timestamp() * 1000)
@@ -36,10 +66,43 @@ def get_date_range(date: datetime, days_before: int = 1) -> tuple:
     end_date = date + timedelta(days=1)
     return start_date, end_date
 
+@lru_cache(maxsize=1024)
 def format_korean_won(amount: float) -> str:
     """금액을 한국 원화 형식으로 포맷팅"""
     return f"₩{amount:,.0f}"
 
+def format_korean_won_array(amounts) -> np.ndarray:
+    """금액 배열을 한국 원화 형식 문자열 배열로 일괄 포맷팅 (format_korean_won의 벡터화 버전)"""
+    rounded = np.rint(np.asarray(amounts, dtype=np.float64))
+    if rounded.size == 0:
+        return np.array([], dtype=str)
+    negative = np.signbit(rounded)
+    values = np.abs(rounded).astype(np.int64)
+    
+    # 1000 단위 그룹으로 분해 (하위 그룹부터)
+    groups = [values % 1000]
+    rest = values // 1000
+    while rest.any():
+        groups.append(rest % 1000)
+        rest //= 1000
+    group_counts = np.ones(values.shape, dtype=np.int64)
+    for k in range(1, len(groups)):
+        group_counts += values >= 1000 ** k
+    
+    # 하위 그룹부터 이어 붙이며, 상위 그룹이 있는 자리만 0으로 3자리 패딩
+    formatted = None
+    for k, group in enumerate(groups):
+        piece = np.char.mod('%d', group)
+        piece = np.where(group_counts > k + 1, np.char.zfill(piece, 3), piece)
+        if formatted is None:
+            formatted = piece
+        else:
+            formatted = np.where(group_counts > k, np.char.add(np.char.add(piece, ','), formatted), formatted)
+    
+    formatted = np.where(negative, np.char.add('-', formatted), formatted)
+    return np.char.add('₩', formatted)
+
+@lru_cache(maxsize=1024)
 def format_percentage(value: float, decimal_places: int = 2) -> str:
     """백분율 형식으로 포맷팅"""
     return f"{value:.{decimal_places}f}%"